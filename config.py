@@ -2,8 +2,11 @@
 import os
 from dotenv import load_dotenv
 
+# .env file next to this module
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+
 # Load environment variables from .env file
-load_dotenv()
+load_dotenv(ENV_FILE)
 
 class Config:
     """Application configuration"""
@@ -30,9 +33,15 @@ class Config:
     FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     
+    # Set once validate() has succeeded; the settings above never change
+    _validated = False
+    
     @classmethod
     def validate(cls):
         """Validate required configuration"""
+        if cls._validated:
+            return True
+        
         missing = []
         
         if not cls.GITHUB_TOKEN:
@@ -44,4 +53,5 @@ class Config:
         if missing:
             raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
         
+        cls._validated = True
         return True
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Shared pytest fixtures for the App Build Deploy System
+"""
+
+import importlib
+
+import pytest
+
+def _load_module(module_name):
+    """Import an app module, skipping the requesting tests if its dependencies are missing"""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        pytest.skip(f"{module_name} unavailable: {e}")
+
+def _task(email, task='captcha-solver-abc12', round_num=1, nonce='nonce-1', statuscode=200):
+    """A task record as logged by the round scripts"""
+    return {
+        'email': email,
+        'secret': 'test_secret',
+        'task': task,
+        'round': round_num,
+        'nonce': nonce,
+        'brief': 'Create a captcha solver',
+        'checks': ['Repo has MIT license'],
+        'evaluation_url': 'http://localhost:5001/api/notify',
+        'endpoint': 'http://localhost:5000/api/build',
+        'statuscode': statuscode,
+        'attachments': []
+    }
+
+@pytest.fixture(scope='session')
+def make_task():
+    """Factory for task records, shared by the database and API tests"""
+    return _task
+
+@pytest.fixture(scope='session')
+def student_client():
+    """In-process test client for the student API"""
+    return _load_module('student_api.app').app.test_client()
+
+@pytest.fixture(scope='session')
+def evaluation_api(tmp_path_factory):
+    """The evaluation API module, backed by a temporary database"""
+    db_path = str(tmp_path_factory.mktemp('evaluation') / 'evaluation.db')
+    
+    # The database is opened at import, so redirect it before importing
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('DATABASE_PATH', db_path)
+        module = _load_module('evaluation_system.evaluation_api')
+    
+    # Never let the tests write to the committed database
+    assert module.DB_PATH == db_path, "evaluation_api was imported before the fixture"
+    
+    yield module
+    module.db.close()
+
+@pytest.fixture(scope='session')
+def evaluation_client(evaluation_api):
+    """In-process test client for the evaluation API"""
+    return evaluation_api.app.test_client()
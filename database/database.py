@@ -1,18 +1,114 @@
+import os
+import queue
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+# Connections kept open per process unless SQLITE_POOL_SIZE overrides it
+DEFAULT_POOL_SIZE = 10
+
+# Per-connection settings applied to every pooled connection; mmap_size
+# is an upper bound, SQLite only maps the pages the database actually has
+CONNECTION_PRAGMAS = '''
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=1073741824;
+    PRAGMA cache_size=-64000;
+    PRAGMA wal_autocheckpoint=1000;
+    PRAGMA busy_timeout=10000;
+'''
+
+# Settings persisted in the database file; page_size only applies to a
+# new database, so it must come before WAL is enabled and tables exist
+DATABASE_PRAGMAS = '''
+    PRAGMA page_size=4096;
+    PRAGMA journal_mode=WAL;
+'''
+
+class ConnectionPool:
+    """Fixed-size pool of reusable SQLite connections"""
+    
+    def __init__(self, db_path, size=None):
+        self.db_path = db_path
+        
+        # An in-memory database only exists inside its own connection
+        if db_path == ':memory:':
+            size = 1
+        self.size = size or int(os.getenv('SQLITE_POOL_SIZE', DEFAULT_POOL_SIZE))
+        
+        self._connections = queue.Queue(maxsize=self.size)
+        for _ in range(self.size):
+            self._connections.put(self._connect())
+    
+    def _connect(self):
+        """Open a connection configured for concurrent access"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.executescript(CONNECTION_PRAGMAS)
+        return conn
+    
+    @contextmanager
+    def acquire(self):
+        """Check a connection out of the pool for the duration of the block"""
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+    
+    def close(self):
+        """Close every connection in the pool"""
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
 class DatabaseManager:
-    def __init__(self, db_path="evaluation.db"):
+    # Column order returned by the get_* helpers, matching the DDL below
+    TASK_COLUMNS = ('id', 'timestamp', 'email', 'task', 'round', 'nonce', 'brief',
+                    'attachments', 'checks', 'evaluation_url', 'endpoint',
+                    'statuscode', 'secret')
+    REPO_COLUMNS = ('id', 'timestamp', 'email', 'task', 'round', 'nonce',
+                    'repo_url', 'commit_sha', 'pages_url')
+    RESULT_COLUMNS = ('id', 'timestamp', 'email', 'task', 'round', 'repo_url',
+                      'commit_sha', 'pages_url', 'check_name', 'score', 'reason',
+                      'logs')
+    SUBMISSION_COLUMNS = ('id', 'timestamp', 'email', 'endpoint', 'secret', 'repo_url')
+    
+    def __init__(self, db_path="evaluation.db", pool_size=None):
         self.db_path = db_path
+        
+        # WAL allows many readers but a single writer, so writes are
+        # serialized in-process instead of spinning on the busy timeout
+        self._lock = threading.Lock()
+        self.pool = ConnectionPool(db_path, pool_size)
+        
         self.init_database()
     
+    def close(self):
+        """Close all pooled database connections"""
+        self.pool.close()
+    
+    @contextmanager
+    def _transaction(self):
+        """Run the block as one write transaction, rolling back on error"""
+        with self._lock, self.pool.acquire() as conn:
+            conn.execute('BEGIN')
+            try:
+                yield conn
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+    
     def init_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        with self.pool.acquire() as conn:
+            conn.executescript(DATABASE_PRAGMAS)
+            self._create_tables(conn.cursor())
+    
+    def _create_tables(self, cursor):
+        """Create the tables if they do not exist yet"""
         # Tasks table - stores tasks sent to students
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS tasks (
@@ -80,22 +176,69 @@ class DatabaseManager:
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        # LLM cache table - stores LLM scores keyed by a hash of the content
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                hash TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                score REAL NOT NULL,
+                reason TEXT,
+                PRIMARY KEY(hash, kind)
+            )
+        ''')
+        
+        # Indexes for the email/task/round lookups used by the get_* and
+        # *_exists helpers (tasks and repos already have a UNIQUE index
+        # on (email, task, round), which also serves (email, task)); the
+        # round-first indexes serve the per-round scans of the round scripts
+        cursor.executescript('''
+            CREATE INDEX IF NOT EXISTS idx_results_email_task ON results(email, task);
+            CREATE INDEX IF NOT EXISTS idx_tasks_email_round ON tasks(email, round);
+            CREATE INDEX IF NOT EXISTS idx_tasks_round_email ON tasks(round, email);
+            CREATE INDEX IF NOT EXISTS idx_repos_email_round ON repos(email, round);
+            CREATE INDEX IF NOT EXISTS idx_repos_round ON repos(round);
+        ''')
+        
+        # Gather planner statistics the first time the indexes are created
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            cursor.execute('ANALYZE')
     
     def insert_task(self, task_data):
         """Insert a new task record"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        with self._lock, self.pool.acquire() as conn:
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO tasks 
+                    (timestamp, email, task, round, nonce, brief, attachments, checks, 
+                     evaluation_url, endpoint, statuscode, secret)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    datetime.now().isoformat(),
+                    task_data['email'],
+                    task_data['task'],
+                    task_data['round'],
+                    task_data['nonce'],
+                    task_data['brief'],
+                    json.dumps(task_data.get('attachments', [])),
+                    json.dumps(task_data.get('checks', [])),
+                    task_data['evaluation_url'],
+                    task_data['endpoint'],
+                    task_data.get('statuscode'),
+                    task_data['secret']
+                ))
+                return True
+            except Exception as e:
+                print(f"Error inserting task: {e}")
+                return False
+    
+    def insert_tasks_bulk(self, tasks):
+        """Insert several task records in a single transaction"""
         try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO tasks 
-                (timestamp, email, task, round, nonce, brief, attachments, checks, 
-                 evaluation_url, endpoint, statuscode, secret)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().isoformat(),
+            # One timestamp for the whole batch rather than one per row
+            timestamp = datetime.now().isoformat()
+            rows = [(
+                timestamp,
                 task_data['email'],
                 task_data['task'],
                 task_data['round'],
@@ -107,56 +250,77 @@ class DatabaseManager:
                 task_data['endpoint'],
                 task_data.get('statuscode'),
                 task_data['secret']
-            ))
-            conn.commit()
+            ) for task_data in tasks]
+            
+            with self._transaction() as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO tasks 
+                    (timestamp, email, task, round, nonce, brief, attachments, checks, 
+                     evaluation_url, endpoint, statuscode, secret)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
             return True
         except Exception as e:
-            print(f"Error inserting task: {e}")
+            print(f"Error inserting tasks: {e}")
             return False
-        finally:
-            conn.close()
     
     def insert_repo(self, repo_data):
         """Insert a new repo submission"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO repos 
-                (timestamp, email, task, round, nonce, repo_url, commit_sha, pages_url)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().isoformat(),
-                repo_data['email'],
-                repo_data['task'],
-                repo_data['round'],
-                repo_data['nonce'],
-                repo_data['repo_url'],
-                repo_data['commit_sha'],
-                repo_data['pages_url']
-            ))
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error inserting repo: {e}")
-            return False
-        finally:
-            conn.close()
+        with self._lock, self.pool.acquire() as conn:
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO repos 
+                    (timestamp, email, task, round, nonce, repo_url, commit_sha, pages_url)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    datetime.now().isoformat(),
+                    repo_data['email'],
+                    repo_data['task'],
+                    repo_data['round'],
+                    repo_data['nonce'],
+                    repo_data['repo_url'],
+                    repo_data['commit_sha'],
+                    repo_data['pages_url']
+                ))
+                return True
+            except Exception as e:
+                print(f"Error inserting repo: {e}")
+                return False
     
     def insert_result(self, result_data):
         """Insert a new evaluation result"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        with self._lock, self.pool.acquire() as conn:
+            try:
+                conn.execute('''
+                    INSERT INTO results 
+                    (timestamp, email, task, round, repo_url, commit_sha, pages_url, 
+                     check_name, score, reason, logs)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    datetime.now().isoformat(),
+                    result_data['email'],
+                    result_data['task'],
+                    result_data['round'],
+                    result_data['repo_url'],
+                    result_data['commit_sha'],
+                    result_data['pages_url'],
+                    result_data['check_name'],
+                    result_data['score'],
+                    result_data.get('reason', ''),
+                    result_data.get('logs', '')
+                ))
+                return True
+            except Exception as e:
+                print(f"Error inserting result: {e}")
+                return False
+    
+    def insert_results_bulk(self, results):
+        """Insert several evaluation results in a single transaction"""
         try:
-            cursor.execute('''
-                INSERT INTO results 
-                (timestamp, email, task, round, repo_url, commit_sha, pages_url, 
-                 check_name, score, reason, logs)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().isoformat(),
+            # One timestamp for the whole batch rather than one per row
+            timestamp = datetime.now().isoformat()
+            rows = [(
+                timestamp,
                 result_data['email'],
                 result_data['task'],
                 result_data['round'],
@@ -167,21 +331,36 @@ class DatabaseManager:
                 result_data['score'],
                 result_data.get('reason', ''),
                 result_data.get('logs', '')
-            ))
-            conn.commit()
+            ) for result_data in results]
+            
+            with self._transaction() as conn:
+                conn.executemany('''
+                    INSERT INTO results 
+                    (timestamp, email, task, round, repo_url, commit_sha, pages_url, 
+                     check_name, score, reason, logs)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
             return True
         except Exception as e:
-            print(f"Error inserting result: {e}")
+            print(f"Error inserting results: {e}")
+            return False
+    
+    def update_task_statuses_bulk(self, statuses):
+        """Update task status codes from (statuscode, email, task, round) tuples in one transaction"""
+        try:
+            with self._transaction() as conn:
+                conn.executemany('''
+                    UPDATE tasks SET statuscode = ?
+                    WHERE email = ? AND task = ? AND round = ?
+                ''', statuses)
+            return True
+        except Exception as e:
+            print(f"Error updating task statuses: {e}")
             return False
-        finally:
-            conn.close()
     
     def get_tasks(self, email=None, round_num=None):
         """Get tasks, optionally filtered by email and round"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM tasks WHERE 1=1"
+        query = f"SELECT {', '.join(self.TASK_COLUMNS)} FROM tasks WHERE 1=1"
         params = []
         
         if email:
@@ -192,20 +371,14 @@ class DatabaseManager:
             query += " AND round = ?"
             params.append(round_num)
         
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        rows = cursor.fetchall()
-        
-        conn.close()
+        with self.pool.acquire() as conn:
+            rows = conn.execute(query, params).fetchall()
         
-        return [dict(zip(columns, row)) for row in rows]
+        return [dict(zip(self.TASK_COLUMNS, row)) for row in rows]
     
     def get_repos(self, email=None, round_num=None):
         """Get repo submissions, optionally filtered by email and round"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM repos WHERE 1=1"
+        query = f"SELECT {', '.join(self.REPO_COLUMNS)} FROM repos WHERE 1=1"
         params = []
         
         if email:
@@ -216,20 +389,14 @@ class DatabaseManager:
             query += " AND round = ?"
             params.append(round_num)
         
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        rows = cursor.fetchall()
+        with self.pool.acquire() as conn:
+            rows = conn.execute(query, params).fetchall()
         
-        conn.close()
-        
-        return [dict(zip(columns, row)) for row in rows]
+        return [dict(zip(self.REPO_COLUMNS, row)) for row in rows]
     
     def get_results(self, email=None, task=None):
         """Get evaluation results, optionally filtered by email and task"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM results WHERE 1=1"
+        query = f"SELECT {', '.join(self.RESULT_COLUMNS)} FROM results WHERE 1=1"
         params = []
         
         if email:
@@ -240,81 +407,108 @@ class DatabaseManager:
             query += " AND task = ?"
             params.append(task)
         
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        rows = cursor.fetchall()
+        with self.pool.acquire() as conn:
+            rows = conn.execute(query, params).fetchall()
         
-        conn.close()
-        
-        return [dict(zip(columns, row)) for row in rows]
+        return [dict(zip(self.RESULT_COLUMNS, row)) for row in rows]
+    
+    def find_task(self, email, round_num, task, nonce):
+        """Get the task matching a submission, or None"""
+        with self.pool.acquire() as conn:
+            row = conn.execute(f'''
+                SELECT {', '.join(self.TASK_COLUMNS)} FROM tasks
+                WHERE email = ? AND task = ? AND round = ? AND nonce = ?
+                LIMIT 1
+            ''', (email, task, round_num, nonce)).fetchone()
+        
+        return dict(zip(self.TASK_COLUMNS, row)) if row else None
     
     def task_exists(self, email, task, round_num):
         """Check if a task already exists"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT COUNT(*) FROM tasks 
-            WHERE email = ? AND task = ? AND round = ?
-        ''', (email, task, round_num))
-        
-        count = cursor.fetchone()[0]
-        conn.close()
-        
-        return count > 0
+        with self.pool.acquire() as conn:
+            cursor = conn.execute('''
+                SELECT 1 FROM tasks 
+                WHERE email = ? AND task = ? AND round = ?
+                LIMIT 1
+            ''', (email, task, round_num))
+            
+            row = cursor.fetchone()
+        
+        return row is not None
     
     def repo_exists(self, email, task, round_num):
         """Check if a repo submission already exists"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT COUNT(*) FROM repos 
-            WHERE email = ? AND task = ? AND round = ?
-        ''', (email, task, round_num))
-        
-        count = cursor.fetchone()[0]
-        conn.close()
-        
-        return count > 0
+        with self.pool.acquire() as conn:
+            cursor = conn.execute('''
+                SELECT 1 FROM repos 
+                WHERE email = ? AND task = ? AND round = ?
+                LIMIT 1
+            ''', (email, task, round_num))
+            
+            row = cursor.fetchone()
+        
+        return row is not None
+    
+    def get_emails_with_round(self, round_num):
+        """Get the set of emails that already have a task for a round"""
+        with self.pool.acquire() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT email FROM tasks WHERE round = ?", (round_num,)
+            ).fetchall()
+        
+        return {row[0] for row in rows}
     
     def insert_submission(self, submission_data):
         """Insert a new submission from Google Form"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO submissions 
-                (timestamp, email, endpoint, secret, repo_url)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().isoformat(),
-                submission_data['email'],
-                submission_data['endpoint'],
-                submission_data['secret'],
-                submission_data.get('repo_url', '')
-            ))
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error inserting submission: {e}")
-            return False
-        finally:
-            conn.close()
+        with self._lock, self.pool.acquire() as conn:
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO submissions 
+                    (timestamp, email, endpoint, secret, repo_url)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (
+                    datetime.now().isoformat(),
+                    submission_data['email'],
+                    submission_data['endpoint'],
+                    submission_data['secret'],
+                    submission_data.get('repo_url', '')
+                ))
+                return True
+            except Exception as e:
+                print(f"Error inserting submission: {e}")
+                return False
     
     def get_submissions(self):
         """Get all submissions"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.pool.acquire() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(self.SUBMISSION_COLUMNS)} FROM submissions"
+            ).fetchall()
         
-        cursor.execute("SELECT * FROM submissions")
-        columns = [description[0] for description in cursor.description]
-        rows = cursor.fetchall()
-        
-        conn.close()
-        
-        return [dict(zip(columns, row)) for row in rows]
+        return [dict(zip(self.SUBMISSION_COLUMNS, row)) for row in rows]
+    
+    def get_llm_score(self, content_hash, kind):
+        """Get a cached LLM (score, reason) for content, or None"""
+        with self.pool.acquire() as conn:
+            row = conn.execute('''
+                SELECT score, reason FROM llm_cache
+                WHERE hash = ? AND kind = ?
+            ''', (content_hash, kind)).fetchone()
+        
+        return tuple(row) if row else None
+    
+    def insert_llm_score(self, content_hash, kind, score, reason):
+        """Cache an LLM score for content"""
+        with self._lock, self.pool.acquire() as conn:
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO llm_cache (hash, kind, score, reason)
+                    VALUES (?, ?, ?, ?)
+                ''', (content_hash, kind, score, reason))
+                return True
+            except Exception as e:
+                print(f"Error caching LLM score: {e}")
+                return False
 
 if __name__ == "__main__":
     # Test the database
@@ -9,11 +9,15 @@ This script evaluates submitted repositories based on various checks:
 """
 
 import os
+import re
 import sys
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import time
-from datetime import datetime
+import hashlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import subprocess
 import tempfile
@@ -35,6 +39,21 @@ except ImportError:
     sync_playwright = None
     print("Warning: Playwright not available, dynamic checks will be skipped")
 
+# README features scored by the non-LLM fallback, found in a single pass
+README_FEATURES_RE = re.compile(
+    r'(?P<headings># )|(?P<code>```)|(?P<sections>setup|installation|usage)|(?P<license>license|mit)',
+    re.IGNORECASE
+)
+
+# MIT as a whole word, matched against the raw bytes of a license file
+MIT_LICENSE_RE = re.compile(rb'\bmit\b', re.IGNORECASE)
+
+# Code file extensions sent for review, in order of preference
+CODE_EXTENSIONS = ('.html', '.css', '.js', '.py', '.java', '.cpp', '.c')
+
+# Directories never searched for code files
+SKIPPED_DIRS = {'.git', 'node_modules'}
+
 class RepositoryEvaluator:
     def __init__(self, db_path=None, openai_api_key=None):
         self.db = DatabaseManager(db_path or 'evaluation.db')
@@ -42,13 +61,64 @@ class RepositoryEvaluator:
             openai.api_key = openai_api_key
         self.openai_available = bool(openai_api_key and openai)
         self.playwright_available = bool(sync_playwright)
+        
+        # Shared HTTP session so keep-alive connections are reused across checks
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+        
+        # Playwright objects are bound to the thread that created them, so
+        # each worker thread launches Chromium once and reuses it
+        self._browser_local = threading.local()
+    
+    def _get_browser(self):
+        """Return the calling thread's browser, launching it on first use"""
+        browser = getattr(self._browser_local, 'browser', None)
+        if browser is None or not browser.is_connected():
+            self.close()
+            self._browser_local.playwright = sync_playwright().start()
+            self._browser_local.browser = self._browser_local.playwright.chromium.launch()
+        return self._browser_local.browser
+    
+    def close(self):
+        """Shut down the browser started by the calling thread"""
+        browser = getattr(self._browser_local, 'browser', None)
+        playwright = getattr(self._browser_local, 'playwright', None)
+        self._browser_local.browser = None
+        self._browser_local.playwright = None
+        
+        try:
+            if browser is not None:
+                browser.close()
+        except Exception:
+            pass
+        finally:
+            if playwright is not None:
+                playwright.stop()
     
     def clone_repository(self, repo_url, commit_sha, temp_dir):
         """Clone repository and checkout specific commit"""
         try:
-            # Clone the repository
+            # Fetch only the commit under evaluation instead of the full history
+            subprocess.run(['git', 'init', '-q', temp_dir], check=True, capture_output=True)
             subprocess.run([
-                'git', 'clone', repo_url, temp_dir
+                'git', 'remote', 'add', 'origin', repo_url
+            ], cwd=temp_dir, check=True, capture_output=True)
+            subprocess.run([
+                'git', 'fetch', '--depth', '1', 'origin', commit_sha
+            ], cwd=temp_dir, check=True, capture_output=True)
+            subprocess.run([
+                'git', 'checkout', '-q', 'FETCH_HEAD'
+            ], cwd=temp_dir, check=True, capture_output=True)
+            
+            return True
+        except subprocess.CalledProcessError:
+            pass
+        
+        try:
+            # Server refused fetching by SHA; fall back to a blobless clone
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            subprocess.run([
+                'git', 'clone', '--filter=blob:none', '--no-checkout', repo_url, temp_dir
             ], check=True, capture_output=True)
             
             # Checkout specific commit
@@ -69,53 +139,113 @@ class RepositoryEvaluator:
             license_path = Path(repo_path) / license_file
             if license_path.exists():
                 try:
-                    content = license_path.read_text(encoding='utf-8').lower()
-                    if 'mit license' in content or 'mit' in content:
+                    # The license name is in the header, so only read the start
+                    with open(license_path, 'rb') as f:
+                        content = f.read(4096)
+                    if MIT_LICENSE_RE.search(content):
                         return True, "MIT license found"
                 except Exception as e:
                     print(f"Error reading license file: {e}")
         
         return False, "MIT license not found"
     
-    def check_readme_quality(self, repo_path):
-        """Check README.md quality using LLM"""
+    def _read_readme(self, repo_path):
+        """Return (README content, None) or (None, reason it is unusable)"""
         readme_path = Path(repo_path) / 'README.md'
         
         if not readme_path.exists():
-            return 0.0, "README.md not found"
+            return None, "README.md not found"
         
         try:
-            readme_content = readme_path.read_text(encoding='utf-8')
+            return readme_path.read_text(encoding='utf-8'), None
         except Exception as e:
-            return 0.0, f"Error reading README.md: {e}"
+            return None, f"Error reading README.md: {e}"
+    
+    def _collect_code_content(self, repo_path):
+        """Return (excerpt of up to 3 code files, None) or (None, reason)"""
+        # Find code files in a single walk, grouped by extension
+        files_by_ext = {ext: [] for ext in CODE_EXTENSIONS}
+        for root, dirs, files in os.walk(repo_path):
+            dirs[:] = [d for d in dirs if d not in SKIPPED_DIRS]
+            for name in files:
+                ext = os.path.splitext(name)[1]
+                if ext in files_by_ext:
+                    files_by_ext[ext].append(os.path.join(root, name))
+            
+            # Only three files are read and HTML comes first
+            if len(files_by_ext['.html']) >= 3:
+                break
+        
+        code_files = [path for ext in CODE_EXTENSIONS for path in files_by_ext[ext]]
+        
+        if not code_files:
+            return None, "No code files found"
+        
+        # Read up to 3 main code files
+        code_content = ""
+        
+        for file_path in code_files[:3]:
+            try:
+                # Only the first 1000 characters are used (at most 4 bytes each)
+                with open(file_path, 'rb') as f:
+                    content = f.read(4000).decode('utf-8', 'ignore')
+                code_content += f"\n\n=== {os.path.basename(file_path)} ===\n{content[:1000]}"
+            except Exception as e:
+                print(f"Error reading {file_path}: {e}")
+        
+        if not code_content:
+            return None, "No readable code files"
+        
+        return code_content, None
+    
+    def _content_hash(self, content):
+        """Key for caching the LLM score of a piece of content"""
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def check_readme_quality(self, repo_path):
+        """Check README.md quality using LLM"""
+        readme_content, error = self._read_readme(repo_path)
+        if readme_content is None:
+            return 0.0, error
         
         if not self.openai_available:
             # Fallback scoring based on basic criteria
             score = 0.0
             criteria_met = []
             
+            features = set()
+            for match in README_FEATURES_RE.finditer(readme_content):
+                features.add(match.lastgroup)
+                if len(features) == 4:
+                    break
+            
             if len(readme_content) > 500:
                 score += 0.2
                 criteria_met.append("adequate length")
             
-            if '# ' in readme_content:
+            if 'headings' in features:
                 score += 0.2
                 criteria_met.append("has headings")
             
-            if any(section in readme_content.lower() for section in ['setup', 'installation', 'usage']):
+            if 'sections' in features:
                 score += 0.2
                 criteria_met.append("has setup/usage sections")
             
-            if any(section in readme_content.lower() for section in ['license', 'mit']):
+            if 'license' in features:
                 score += 0.2
                 criteria_met.append("mentions license")
             
-            if '```' in readme_content:
+            if 'code' in features:
                 score += 0.2
                 criteria_met.append("has code examples")
             
             return min(score, 1.0), f"Basic criteria met: {', '.join(criteria_met)}"
         
+        readme_hash = self._content_hash(readme_content)
+        cached = self.db.get_llm_score(readme_hash, 'readme')
+        if cached:
+            return cached
+        
         try:
             prompt = f"""
             Evaluate the quality of this README.md file on a scale of 0.0 to 1.0:
@@ -144,11 +274,13 @@ class RepositoryEvaluator:
             score_line = lines[0]
             
             try:
-                score = float(score_line.split()[0])
+                score = min(max(float(score_line.split()[0]), 0.0), 1.0)
                 explanation = ' '.join(lines[1:]) if len(lines) > 1 else "LLM evaluation"
-                return min(max(score, 0.0), 1.0), explanation
             except (ValueError, IndexError):
                 return 0.5, f"LLM response parsing error: {result}"
+            
+            self.db.insert_llm_score(readme_hash, 'readme', score, explanation)
+            return score, explanation
                 
         except Exception as e:
             return 0.5, f"LLM evaluation error: {e}"
@@ -158,28 +290,14 @@ class RepositoryEvaluator:
         if not self.openai_available:
             return 0.5, "LLM not available for code quality check"
         
-        # Find code files
-        code_files = []
-        for ext in ['.html', '.css', '.js', '.py', '.java', '.cpp', '.c']:
-            code_files.extend(Path(repo_path).glob(f'**/*{ext}'))
+        code_content, error = self._collect_code_content(repo_path)
+        if code_content is None:
+            return 0.0, error
         
-        if not code_files:
-            return 0.0, "No code files found"
-        
-        # Read up to 3 main code files
-        code_content = ""
-        files_read = 0
-        
-        for file_path in code_files[:3]:
-            try:
-                content = file_path.read_text(encoding='utf-8')
-                code_content += f"\n\n=== {file_path.name} ===\n{content[:1000]}"
-                files_read += 1
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-        
-        if not code_content:
-            return 0.0, "No readable code files"
+        code_hash = self._content_hash(code_content)
+        cached = self.db.get_llm_score(code_hash, 'code')
+        if cached:
+            return cached
         
         try:
             prompt = f"""
@@ -208,19 +326,102 @@ class RepositoryEvaluator:
             score_line = lines[0]
             
             try:
-                score = float(score_line.split()[0])
+                score = min(max(float(score_line.split()[0]), 0.0), 1.0)
                 explanation = ' '.join(lines[1:]) if len(lines) > 1 else "LLM code evaluation"
-                return min(max(score, 0.0), 1.0), explanation
             except (ValueError, IndexError):
                 return 0.5, f"LLM response parsing error: {result}"
+            
+            self.db.insert_llm_score(code_hash, 'code', score, explanation)
+            return score, explanation
                 
         except Exception as e:
             return 0.5, f"LLM code evaluation error: {e}"
     
+    def _evaluate_llm_combined(self, readme_content, code_content):
+        """Score README and code quality with a single LLM request
+        
+        Returns ((readme_score, readme_reason), (code_score, code_reason)),
+        or None if the request or its JSON response fails.
+        """
+        try:
+            prompt = f"""
+            Evaluate the quality of this README.md file and this code, each on a scale of 0.0 to 1.0.
+
+            README.md:
+            {readme_content[:2000]}...
+
+            For the README consider:
+            - Professional presentation
+            - Clear structure and organization
+            - Comprehensive setup instructions
+            - Usage examples
+            - Code explanation
+            - License information
+
+            Code:
+            {code_content[:3000]}...
+
+            For the code consider:
+            - Code organization and structure
+            - Comments and documentation
+            - Error handling
+            - Best practices
+            - Functionality implementation
+
+            Respond with a JSON object with the keys "readme_score", "readme_reason",
+            "code_score" and "code_reason", where the scores are numbers between 0.0 and 1.0
+            and the reasons are brief explanations.
+            """
+            
+            response = openai.ChatCompletion.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=400,
+                response_format={"type": "json_object"}
+            )
+            
+            result = json.loads(response.choices[0].message.content)
+            readme_score = min(max(float(result['readme_score']), 0.0), 1.0)
+            code_score = min(max(float(result['code_score']), 0.0), 1.0)
+            
+            return (
+                (readme_score, result.get('readme_reason') or "LLM evaluation"),
+                (code_score, result.get('code_reason') or "LLM code evaluation")
+            )
+        except Exception as e:
+            print(f"Combined LLM evaluation failed, scoring checks separately: {e}")
+            return None
+    
+    def check_quality(self, repo_path):
+        """Check README and code quality, using one LLM request when possible"""
+        if self.openai_available:
+            readme_content, _ = self._read_readme(repo_path)
+            code_content, _ = self._collect_code_content(repo_path)
+            
+            if readme_content is not None and code_content is not None:
+                readme_hash = self._content_hash(readme_content)
+                code_hash = self._content_hash(code_content)
+                readme_cached = self.db.get_llm_score(readme_hash, 'readme')
+                code_cached = self.db.get_llm_score(code_hash, 'code')
+                if readme_cached and code_cached:
+                    return readme_cached, code_cached
+                
+                combined = self._evaluate_llm_combined(readme_content, code_content)
+                if combined:
+                    self.db.insert_llm_score(readme_hash, 'readme', *combined[0])
+                    self.db.insert_llm_score(code_hash, 'code', *combined[1])
+                    return combined
+        
+        return self.check_readme_quality(repo_path), self.check_code_quality(repo_path)
+    
     def check_pages_accessibility(self, pages_url):
         """Check if GitHub Pages is accessible"""
         try:
-            response = requests.get(pages_url, timeout=10)
+            # Only the status code matters, so skip downloading the body
+            response = self.session.head(pages_url, timeout=10, allow_redirects=True)
+            if response.status_code in (405, 501):
+                response = self.session.get(pages_url, timeout=10)
+            
             if response.status_code == 200:
                 return True, f"Pages accessible (HTTP {response.status_code})"
             else:
@@ -228,80 +429,104 @@ class RepositoryEvaluator:
         except Exception as e:
             return False, f"Pages accessibility error: {e}"
     
+    def _page_satisfies(self, page, expression, arg=None, timeout=5000):
+        """Wait until a JavaScript predicate holds on the page, so content set by scripts is seen"""
+        try:
+            page.wait_for_function(expression, arg=arg, timeout=timeout)
+            return True
+        except Exception:
+            return False
+    
+    def _page_shows_text(self, page, text, timeout=5000):
+        """Wait until the page body contains text (case-insensitive)"""
+        return self._page_satisfies(
+            page,
+            "text => document.body.innerText.toLowerCase().includes(text)",
+            arg=text,
+            timeout=timeout
+        )
+    
     def dynamic_check_playwright(self, pages_url, task_data):
         """Run dynamic checks using Playwright"""
         if not self.playwright_available:
             return 0.5, "Playwright not available for dynamic checks"
         
+        # Parameterised tasks are opened with their test parameter straight
+        # away so that every check needs a single navigation
+        task_type = task_data.get('task', '').split('-')[0]
+        if task_type == 'captcha':
+            target_url = f"{pages_url}?url=test"
+        elif task_type == 'weather':
+            target_url = f"{pages_url}?city=London"
+        else:
+            target_url = pages_url
+        
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch()
-                page = browser.new_page()
+            context = self._get_browser().new_context()
+            try:
+                page = context.new_page()
                 
                 # Navigate to the page
-                page.goto(pages_url, timeout=30000)
-                
-                # Wait for page to load
-                page.wait_for_load_state('networkidle')
+                page.goto(target_url, timeout=30000, wait_until='domcontentloaded')
                 
                 score = 0.0
                 checks_passed = []
                 
-                # Check if page loads without errors
-                title = page.title()
-                if title and title.strip():
+                # Check if page loads without errors; the DOM is checked as
+                # soon as it is parsed, so poll for script-set titles and content
+                if self._page_satisfies(page, "() => document.title.trim().length > 0"):
                     score += 0.3
                     checks_passed.append("page has title")
                 
                 # Check if page has content
-                body_text = page.inner_text('body')
-                if len(body_text.strip()) > 50:
+                if self._page_satisfies(page, "() => document.body.innerText.trim().length > 50"):
                     score += 0.3
                     checks_passed.append("page has content")
                 
                 # Check for task-specific functionality
-                task_type = task_data.get('task', '').split('-')[0]
-                
                 if task_type == 'captcha':
-                    # Look for URL parameter handling
-                    test_url = f"{pages_url}?url=test"
-                    page.goto(test_url)
-                    
                     # Check if URL parameter is processed
-                    if 'test' in page.inner_text('body').lower():
+                    if self._page_shows_text(page, 'test'):
                         score += 0.4
                         checks_passed.append("URL parameter handling")
                 
                 elif task_type == 'weather':
-                    # Look for city parameter handling
-                    test_url = f"{pages_url}?city=London"
-                    page.goto(test_url)
-                    
                     # Check if city parameter is processed
-                    if 'london' in page.inner_text('body').lower():
+                    if self._page_shows_text(page, 'london'):
                         score += 0.4
                         checks_passed.append("city parameter handling")
                 
                 elif task_type == 'todo':
-                    # Look for todo functionality
-                    try:
-                        # Try to find input fields or buttons
-                        inputs = page.query_selector_all('input')
-                        buttons = page.query_selector_all('button')
-                        
-                        if inputs and buttons:
-                            score += 0.4
-                            checks_passed.append("todo interface elements")
-                    except:
-                        pass
-                
-                browser.close()
+                    # Look for todo functionality, which may be rendered by script
+                    if self._page_satisfies(
+                        page,
+                        "() => document.querySelector('input') !== null && document.querySelector('button') !== null"
+                    ):
+                        score += 0.4
+                        checks_passed.append("todo interface elements")
                 
                 return min(score, 1.0), f"Dynamic checks passed: {', '.join(checks_passed)}"
+            finally:
+                context.close()
                 
         except Exception as e:
             return 0.0, f"Dynamic check error: {e}"
     
+    def _run_repository_checks(self, repo_url, commit_sha):
+        """Clone the repository and run the checks that need its files
+        
+        Returns the (license, README, code) check results, or None if the
+        repository could not be cloned.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if not self.clone_repository(repo_url, commit_sha, temp_dir):
+                return None
+            
+            license_check = self.check_mit_license(temp_dir)
+            readme_check, code_check = self.check_quality(temp_dir)
+            
+            return license_check, readme_check, code_check
+    
     def evaluate_repository(self, repo_data):
         """Evaluate a single repository"""
         email = repo_data['email']
@@ -315,73 +540,77 @@ class RepositoryEvaluator:
         
         results = []
         
-        # Create temporary directory for cloning
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Clone repository
-            clone_success = self.clone_repository(repo_url, commit_sha, temp_dir)
-            
-            if clone_success:
-                # Check MIT license
-                has_license, license_reason = self.check_mit_license(temp_dir)
-                results.append({
-                    'email': email,
-                    'task': task,
-                    'round': round_num,
-                    'repo_url': repo_url,
-                    'commit_sha': commit_sha,
-                    'pages_url': pages_url,
-                    'check_name': 'MIT License',
-                    'score': 1.0 if has_license else 0.0,
-                    'reason': license_reason,
-                    'logs': ''
-                })
-                
-                # Check README quality
-                readme_score, readme_reason = self.check_readme_quality(temp_dir)
-                results.append({
-                    'email': email,
-                    'task': task,
-                    'round': round_num,
-                    'repo_url': repo_url,
-                    'commit_sha': commit_sha,
-                    'pages_url': pages_url,
-                    'check_name': 'README Quality',
-                    'score': readme_score,
-                    'reason': readme_reason,
-                    'logs': ''
-                })
-                
-                # Check code quality
-                code_score, code_reason = self.check_code_quality(temp_dir)
-                results.append({
-                    'email': email,
-                    'task': task,
-                    'round': round_num,
-                    'repo_url': repo_url,
-                    'commit_sha': commit_sha,
-                    'pages_url': pages_url,
-                    'check_name': 'Code Quality',
-                    'score': code_score,
-                    'reason': code_reason,
-                    'logs': ''
-                })
-            else:
-                # Repository clone failed
-                results.append({
-                    'email': email,
-                    'task': task,
-                    'round': round_num,
-                    'repo_url': repo_url,
-                    'commit_sha': commit_sha,
-                    'pages_url': pages_url,
-                    'check_name': 'Repository Access',
-                    'score': 0.0,
-                    'reason': 'Failed to clone repository',
-                    'logs': ''
-                })
-        
-        # Check GitHub Pages accessibility
-        pages_accessible, pages_reason = self.check_pages_accessibility(pages_url)
+        # The repository checks (clone, license, LLM) and the deployed site
+        # checks (HTTP, browser) are independent, so they run concurrently.
+        # The browser belongs to this thread, so the site checks stay here.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            repo_future = executor.submit(self._run_repository_checks, repo_url, commit_sha)
+            
+            # Check GitHub Pages accessibility
+            pages_accessible, pages_reason = self.check_pages_accessibility(pages_url)
+            
+            # Dynamic checks with Playwright
+            if pages_accessible:
+                dynamic_score, dynamic_reason = self.dynamic_check_playwright(pages_url, repo_data)
+            
+            repo_checks = repo_future.result()
+        
+        if repo_checks:
+            (has_license, license_reason), (readme_score, readme_reason), (code_score, code_reason) = repo_checks
+            
+            results.append({
+                'email': email,
+                'task': task,
+                'round': round_num,
+                'repo_url': repo_url,
+                'commit_sha': commit_sha,
+                'pages_url': pages_url,
+                'check_name': 'MIT License',
+                'score': 1.0 if has_license else 0.0,
+                'reason': license_reason,
+                'logs': ''
+            })
+            
+            results.append({
+                'email': email,
+                'task': task,
+                'round': round_num,
+                'repo_url': repo_url,
+                'commit_sha': commit_sha,
+                'pages_url': pages_url,
+                'check_name': 'README Quality',
+                'score': readme_score,
+                'reason': readme_reason,
+                'logs': ''
+            })
+            
+            results.append({
+                'email': email,
+                'task': task,
+                'round': round_num,
+                'repo_url': repo_url,
+                'commit_sha': commit_sha,
+                'pages_url': pages_url,
+                'check_name': 'Code Quality',
+                'score': code_score,
+                'reason': code_reason,
+                'logs': ''
+            })
+        else:
+            # Repository clone failed
+            results.append({
+                'email': email,
+                'task': task,
+                'round': round_num,
+                'repo_url': repo_url,
+                'commit_sha': commit_sha,
+                'pages_url': pages_url,
+                'check_name': 'Repository Access',
+                'score': 0.0,
+                'reason': 'Failed to clone repository',
+                'logs': ''
+            })
+        
         results.append({
             'email': email,
             'task': task,
@@ -395,9 +624,7 @@ class RepositoryEvaluator:
             'logs': ''
         })
         
-        # Dynamic checks with Playwright
         if pages_accessible:
-            dynamic_score, dynamic_reason = self.dynamic_check_playwright(pages_url, repo_data)
             results.append({
                 'email': email,
                 'task': task,
@@ -412,12 +639,11 @@ class RepositoryEvaluator:
             })
         
         # Store results in database
-        for result in results:
-            self.db.insert_result(result)
+        self.db.insert_results_bulk(results)
         
         return results
     
-    def evaluate_all_repositories(self):
+    def evaluate_all_repositories(self, max_workers=8):
         """Evaluate all repositories in the database"""
         repos = self.db.get_repos()
         
@@ -427,12 +653,32 @@ class RepositoryEvaluator:
         
         print(f"Found {len(repos)} repositories to evaluate")
         
+        pending = queue.Queue()
         for repo in repos:
-            try:
-                self.evaluate_repository(repo)
-                time.sleep(2)  # Brief delay between evaluations
-            except Exception as e:
-                print(f"Error evaluating repository for {repo['email']}: {e}")
+            pending.put(repo)
+        
+        # Evaluations are dominated by network waits (clone, HTTP, LLM,
+        # browser), so several repositories are processed concurrently
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in range(min(max_workers, len(repos))):
+                executor.submit(self._evaluation_worker, pending)
+    
+    def _evaluation_worker(self, pending):
+        """Evaluate queued repositories until none are left"""
+        try:
+            while True:
+                try:
+                    repo = pending.get_nowait()
+                except queue.Empty:
+                    return
+                
+                try:
+                    self.evaluate_repository(repo)
+                except Exception as e:
+                    print(f"Error evaluating repository for {repo['email']}: {e}")
+        finally:
+            # The browser belongs to this thread, so release it here
+            self.close()
 
 def main():
     """Main function"""
@@ -443,6 +689,8 @@ def main():
                        help='Path to database file (default: evaluation.db)')
     parser.add_argument('--openai-key',
                        help='OpenAI API key for LLM evaluations')
+    parser.add_argument('--workers', type=int, default=8,
+                       help='Number of repositories to evaluate in parallel (default: 8)')
     
     args = parser.parse_args()
     
@@ -453,10 +701,11 @@ def main():
     print(f"Database: {args.db_path or 'evaluation.db'}")
     print(f"OpenAI available: {evaluator.openai_available}")
     print(f"Playwright available: {evaluator.playwright_available}")
+    print(f"Workers: {args.workers}")
     print()
     
     # Evaluate all repositories
-    evaluator.evaluate_all_repositories()
+    evaluator.evaluate_all_repositories(args.workers)
     
     print("\n=== Evaluation Complete ===")
 
@@ -1,40 +1,78 @@
 from flask import Flask, request, jsonify
+from flask_caching import Cache
+import fastjsonschema
 import os
 import sys
 from datetime import datetime
+from pathlib import Path
 
-# Add the database directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'database'))
+# Paths resolved once at import; DATABASE_PATH points the API at another database
+_ROOT = Path(__file__).resolve().parent.parent
+DB_PATH = os.getenv('DATABASE_PATH') or str(_ROOT / 'database' / 'evaluation.db')
+
+# Add the project root and database directory to the path; neither is a
+# package, and this module is also run directly as a script
+sys.path.append(str(_ROOT))
+sys.path.append(str(_ROOT / 'database'))
 from database import DatabaseManager
+from json_provider import ORJSONProvider
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Cache GET responses briefly in Redis, which every worker shares. Without
+# it nothing is cached: gunicorn runs several workers, and a per-process
+# cache would keep serving listings that another worker's notify cleared
+if os.getenv('REDIS_HOST'):
+    cache = Cache(app, config={
+        'CACHE_TYPE': 'RedisCache',
+        'CACHE_REDIS_HOST': os.getenv('REDIS_HOST'),
+        'CACHE_REDIS_PORT': int(os.getenv('REDIS_PORT', 6379)),
+        'CACHE_DEFAULT_TIMEOUT': 30,
+        'CACHE_KEY_PREFIX': 'eval_'
+    })
+else:
+    cache = Cache(app, config={'CACHE_TYPE': 'NullCache'})
+
+def is_success(response):
+    """Only cache successful responses"""
+    return response[1] == 200
+
+# Repo submission notifications, validated by a schema compiled once at import
+validate_notification = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['email', 'task', 'round', 'nonce', 'repo_url', 'commit_sha', 'pages_url'],
+    'properties': {
+        'email': {'type': 'string'},
+        'task': {'type': 'string'},
+        'round': {'type': 'integer'},
+        'nonce': {'type': 'string'},
+        'repo_url': {'type': 'string'},
+        'commit_sha': {'type': 'string'},
+        'pages_url': {'type': 'string'}
+    }
+})
 
 # Initialize database
-db = DatabaseManager(os.path.join(os.path.dirname(__file__), '..', 'database', 'evaluation.db'))
+db = DatabaseManager(DB_PATH)
 
 @app.route('/api/notify', methods=['POST'])
 def receive_notification():
     """Receive repo submission notifications from students"""
     try:
-        data = request.get_json()
+        # Malformed JSON is a client error, not an internal one
+        data = request.get_json(silent=True)
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+            return jsonify({'error': 'No valid JSON data provided'}), 400
         
         # Validate required fields
-        required_fields = ['email', 'task', 'round', 'nonce', 'repo_url', 'commit_sha', 'pages_url']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+        try:
+            validate_notification(data)
+        except fastjsonschema.JsonSchemaException as e:
+            return jsonify({'error': f'Invalid request: {e.message}'}), 400
         
         # Check if matching task exists
-        tasks = db.get_tasks(email=data['email'], round_num=data['round'])
-        matching_task = None
-        
-        for task in tasks:
-            if (task['task'] == data['task'] and 
-                task['nonce'] == data['nonce']):
-                matching_task = task
-                break
+        matching_task = db.find_task(data['email'], data['round'], data['task'], data['nonce'])
         
         if not matching_task:
             return jsonify({
@@ -55,6 +93,8 @@ def receive_notification():
         success = db.insert_repo(repo_data)
         
         if success:
+            # Cached listings no longer include this submission
+            cache.clear()
             print(f"Received repo submission from {data['email']} for task {data['task']} round {data['round']}")
             return jsonify({'status': 'success', 'message': 'Repo submission received'}), 200
         else:
@@ -65,6 +105,7 @@ def receive_notification():
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
 @app.route('/api/results', methods=['GET'])
+@cache.cached(timeout=30, query_string=True, response_filter=is_success)
 def get_results():
     """Get evaluation results"""
     try:
@@ -84,6 +125,7 @@ def get_results():
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
 @app.route('/api/tasks', methods=['GET'])
+@cache.cached(timeout=30, query_string=True, response_filter=is_success)
 def get_tasks():
     """Get tasks"""
     try:
@@ -103,6 +145,7 @@ def get_tasks():
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
 @app.route('/api/repos', methods=['GET'])
+@cache.cached(timeout=30, query_string=True, response_filter=is_success)
 def get_repos():
     """Get repo submissions"""
     try:
@@ -132,5 +175,5 @@ def health_check():
 
 if __name__ == '__main__':
     print("Starting evaluation API server...")
-    print("Database location:", os.path.join(os.path.dirname(__file__), '..', 'database', 'evaluation.db'))
+    print("Database location:", DB_PATH)
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
@@ -9,25 +9,33 @@ It sends task requests to student endpoints and logs the results.
 import csv
 import json
 import uuid
-import hashlib
+import asyncio
 import random
-import requests
-import time
+import xxhash
 import os
 import sys
+from functools import lru_cache
+from types import MappingProxyType
 from datetime import datetime, timedelta
 from pathlib import Path
 
-# Add the database directory to the path
+# Add the database directory and this directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'database'))
+sys.path.append(os.path.dirname(__file__))
 from database import DatabaseManager
+from task_sender import send_tasks
+
+# Upper bound on task requests in flight at once
+MAX_CONCURRENT_SENDS = 20
 
 class TaskTemplates:
     """Task templates for different types of applications"""
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_templates():
-        return {
+        """Return the shared, read-only template mapping"""
+        return MappingProxyType({
             'captcha-solver': {
                 'round1': {
                     'brief': "Create a captcha solver that handles ?url=https://.../image.png. Default to attached sample. Display the solved captcha text within 15 seconds.",
@@ -100,7 +108,7 @@ class TaskTemplates:
                     ]
                 }
             }
-        }
+        })
 
 class Round1TaskGenerator:
     def __init__(self, evaluation_url, db_path=None):
@@ -108,19 +116,20 @@ class Round1TaskGenerator:
         self.db = DatabaseManager(db_path or 'evaluation.db')
         self.templates = TaskTemplates.get_templates()
     
-    def generate_task_id(self, template_id, brief, attachments):
+    @staticmethod
+    def generate_task_id(template_id, brief, attachments):
         """Generate a unique task ID based on template and content"""
         content = f"{brief}{json.dumps(attachments or [])}"
-        hash_value = hashlib.md5(content.encode()).hexdigest()[:5]
+        hash_value = xxhash.xxh3_64_hexdigest(content.encode())[:5]
         return f"{template_id}-{hash_value}"
     
     def select_template(self, email, date_hour):
         """Select a template based on email and date for deterministic randomness"""
-        seed = hashlib.md5(f"{email}{date_hour}".encode()).hexdigest()
-        random.seed(seed)
+        seed = xxhash.xxh3_64_intdigest(f"{email}{date_hour}".encode())
         
+        # A local generator leaves the global random state untouched
         template_ids = list(self.templates.keys())
-        selected_id = random.choice(template_ids)
+        selected_id = random.Random(seed).choice(template_ids)
         
         return selected_id, self.templates[selected_id]
     
@@ -135,8 +144,7 @@ class Round1TaskGenerator:
             round1_template = template['round1']
             
             # Generate task data
-            task_id = self.generate_task_id(template_id, round1_template['brief'], 
-                                          round1_template.get('attachments'))
+            task_id = _TASK_ID_CACHE[template_id]
             nonce = str(uuid.uuid4())
             
             task_data = {
@@ -157,30 +165,17 @@ class Round1TaskGenerator:
             print(f"Error generating task for {email}: {e}")
             return None
     
-    def send_task(self, endpoint, task_data):
-        """Send task to student endpoint"""
-        try:
-            response = requests.post(
-                endpoint,
-                headers={'Content-Type': 'application/json'},
-                json=task_data,
-                timeout=30
-            )
-            
-            print(f"Sent task to {endpoint}: HTTP {response.status_code}")
-            return response.status_code
-            
-        except Exception as e:
-            print(f"Error sending task to {endpoint}: {e}")
-            return None
-    
     def process_submissions(self, submissions_file):
         """Process all submissions and generate round 1 tasks"""
         processed_count = 0
         skipped_count = 0
         error_count = 0
+        pending = []
         
         try:
+            # Emails that already received a round 1 task
+            already_sent = self.db.get_emails_with_round(1)
+            
             with open(submissions_file, 'r', newline='', encoding='utf-8') as file:
                 reader = csv.DictReader(file)
                 
@@ -192,7 +187,7 @@ class Round1TaskGenerator:
                     print(f"\nProcessing submission for {email}")
                     
                     # Check if round 1 task already exists
-                    if self.db.task_exists(email, None, 1):  # Check any round 1 task for this email
+                    if email in already_sent:
                         print(f"Skipping {email}: Round 1 task already exists")
                         skipped_count += 1
                         continue
@@ -204,25 +199,11 @@ class Round1TaskGenerator:
                         error_count += 1
                         continue
                     
-                    # Send task to student endpoint
-                    status_code = self.send_task(endpoint, task_data)
-                    
-                    # Log task to database
-                    task_record = task_data.copy()
-                    task_record['endpoint'] = endpoint
-                    task_record['statuscode'] = status_code
-                    
-                    success = self.db.insert_task(task_record)
-                    
-                    if success:
-                        print(f"Successfully processed {email}")
-                        processed_count += 1
-                    else:
-                        print(f"Error logging task for {email}")
-                        error_count += 1
-                    
-                    # Brief delay between requests
-                    time.sleep(1)
+                    pending.append((endpoint, task_data))
+                    already_sent.add(email)
+            
+            # Send all tasks to student endpoints at once
+            status_codes = asyncio.run(send_tasks(pending, MAX_CONCURRENT_SENDS))
         
         except FileNotFoundError:
             print(f"Error: Submissions file '{submissions_file}' not found")
@@ -231,11 +212,35 @@ class Round1TaskGenerator:
             print(f"Error processing submissions: {e}")
             return
         
+        # Log all tasks to database in one transaction
+        task_records = []
+        for (endpoint, task_data), status_code in zip(pending, status_codes):
+            task_record = task_data.copy()
+            task_record['endpoint'] = endpoint
+            task_record['statuscode'] = status_code
+            task_records.append(task_record)
+        
+        if task_records:
+            if self.db.insert_tasks_bulk(task_records):
+                for task_record in task_records:
+                    print(f"Successfully processed {task_record['email']}")
+                processed_count += len(task_records)
+            else:
+                print(f"Error logging {len(task_records)} tasks")
+                error_count += len(task_records)
+        
         print(f"\n=== Round 1 Processing Complete ===")
         print(f"Processed: {processed_count}")
         print(f"Skipped: {skipped_count}")
         print(f"Errors: {error_count}")
 
+# Task IDs only depend on the template, so derive them once at import
+_TASK_ID_CACHE = {
+    template_id: Round1TaskGenerator.generate_task_id(
+        template_id, template['round1']['brief'], template['round1'].get('attachments'))
+    for template_id, template in TaskTemplates.get_templates().items()
+}
+
 def main():
     """Main function"""
     import argparse
@@ -6,25 +6,46 @@ This script generates round 2 tasks for students who have completed round 1.
 It sends modification/enhancement requests to student endpoints.
 """
 
-import json
 import uuid
-import hashlib
+import asyncio
+import orjson
 import random
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import os
 import sys
-from datetime import datetime
 
-# Add the database directory to the path
+# Add the database directory and this directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'database'))
+sys.path.append(os.path.dirname(__file__))
 from database import DatabaseManager
+from task_sender import send_tasks
+
+# Upper bound on retried task requests in flight at once
+MAX_CONCURRENT_RETRIES = 10
+
+# Extra attempts for a send that fails to connect or hits a gateway error
+MAX_SEND_RETRIES = 2
 
 class Round2TaskGenerator:
     def __init__(self, evaluation_url, db_path=None):
         self.evaluation_url = evaluation_url
         self.db = DatabaseManager(db_path or 'evaluation.db')
         
+        # Own generator so template picks don't depend on the global random state
+        self.rng = random.Random()
+        
+        # Shared HTTP session so keep-alive connections are reused across students,
+        # retrying POSTs that fail to connect or hit a gateway error
+        retry = Retry(total=MAX_SEND_RETRIES, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                      allowed_methods=frozenset(['POST']), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         # Round 2 templates based on original tasks
         self.round2_templates = {
             'captcha-solver': [
@@ -116,7 +137,7 @@ class Round2TaskGenerator:
             
             # Select a random round 2 template for this task type
             templates = self.round2_templates[task_type]
-            selected_template = random.choice(templates)
+            selected_template = self.rng.choice(templates)
             
             # Generate new task data
             nonce = str(uuid.uuid4())
@@ -142,7 +163,7 @@ class Round2TaskGenerator:
     def send_task(self, endpoint, task_data):
         """Send task to student endpoint"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 endpoint,
                 headers={'Content-Type': 'application/json'},
                 json=task_data,
@@ -168,6 +189,17 @@ class Round2TaskGenerator:
         processed_count = 0
         skipped_count = 0
         error_count = 0
+        task_records = []
+        
+        # Load existing tasks once instead of querying per repo
+        round1_tasks = {
+            (task_record['email'], task_record['task']): task_record
+            for task_record in self.db.get_tasks(round_num=1)
+        }
+        round2_sent = {
+            (task_record['email'], task_record['task'])
+            for task_record in self.db.get_tasks(round_num=2)
+        }
         
         for repo in round1_repos:
             email = repo['email']
@@ -176,19 +208,13 @@ class Round2TaskGenerator:
             print(f"\nProcessing round 2 for {email} - {task}")
             
             # Check if round 2 task already exists
-            if self.db.task_exists(email, task, 2):
+            if (email, task) in round2_sent:
                 print(f"Skipping {email}: Round 2 task already exists for {task}")
                 skipped_count += 1
                 continue
             
             # Get original round 1 task data
-            round1_tasks = self.db.get_tasks(email=email, round_num=1)
-            original_task = None
-            
-            for task_record in round1_tasks:
-                if task_record['task'] == task:
-                    original_task = task_record
-                    break
+            original_task = round1_tasks.get((email, task))
             
             if not original_task:
                 print(f"Error: Could not find original round 1 task for {email} - {task}")
@@ -206,23 +232,24 @@ class Round2TaskGenerator:
             endpoint = original_task['endpoint']
             status_code = self.send_task(endpoint, round2_task)
             
-            # Log task to database
             task_record = round2_task.copy()
             task_record['endpoint'] = endpoint
             task_record['statuscode'] = status_code
-            
-            success = self.db.insert_task(task_record)
-            
-            if success:
-                print(f"Successfully processed round 2 for {email}")
-                processed_count += 1
-            else:
-                print(f"Error logging round 2 task for {email}")
-                error_count += 1
+            task_records.append(task_record)
             
             # Brief delay between requests
             time.sleep(1)
         
+        # Log all tasks to database in one transaction
+        if task_records:
+            if self.db.insert_tasks_bulk(task_records):
+                for task_record in task_records:
+                    print(f"Successfully processed round 2 for {task_record['email']}")
+                processed_count += len(task_records)
+            else:
+                print(f"Error logging {len(task_records)} round 2 tasks")
+                error_count += len(task_records)
+        
         print(f"\n=== Round 2 Processing Complete ===")
         print(f"Processed: {processed_count}")
         print(f"Skipped: {skipped_count}")
@@ -246,6 +273,7 @@ class Round2TaskGenerator:
         print(f"Found {len(failed_tasks)} failed round 2 tasks to retry")
         
         retry_count = 0
+        pending = []
         
         for task in failed_tasks:
             print(f"\nRetrying round 2 task for {task['email']} - {task['task']}")
@@ -258,23 +286,32 @@ class Round2TaskGenerator:
                 'round': task['round'],
                 'nonce': task['nonce'],
                 'brief': task['brief'],
-                'checks': json.loads(task['checks']) if task['checks'] else [],
+                'checks': orjson.loads(task['checks']) if task['checks'] else [],
                 'evaluation_url': task['evaluation_url'],
-                'attachments': json.loads(task['attachments']) if task['attachments'] else []
+                'attachments': orjson.loads(task['attachments']) if task['attachments'] else []
             }
             
-            # Send task
-            status_code = self.send_task(task['endpoint'], task_data)
-            
+            pending.append((task['endpoint'], task_data))
+        
+        # Send all retries at once, with the same retry policy as single sends
+        status_codes = asyncio.run(send_tasks(pending, MAX_CONCURRENT_RETRIES,
+                                              label='round 2 task', retries=MAX_SEND_RETRIES))
+        
+        statuses = []
+        for (_, task_data), status_code in zip(pending, status_codes):
             if status_code == 200:
-                # Update task record with new status code
-                # Note: This would require an update method in DatabaseManager
-                print(f"Successfully retried round 2 task for {task['email']}")
+                print(f"Successfully retried round 2 task for {task_data['email']}")
                 retry_count += 1
             else:
-                print(f"Retry failed for {task['email']}")
+                print(f"Retry failed for {task_data['email']}")
             
-            time.sleep(2)  # Longer delay for retries
+            # A send that never got a response keeps the previous status code
+            if status_code is not None:
+                statuses.append((status_code, task_data['email'], task_data['task'], task_data['round']))
+        
+        # Record the new status codes in one transaction
+        if not self.db.update_task_statuses_bulk(statuses):
+            print("Error updating round 2 task status codes")
         
         print(f"\n=== Round 2 Retry Complete ===")
         print(f"Successfully retried: {retry_count}")
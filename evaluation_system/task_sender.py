@@ -0,0 +1,55 @@
+"""
+Task Sender
+
+Delivers task requests to student endpoints concurrently, shared by the
+round 1 and round 2 scripts.
+"""
+
+import asyncio
+import aiohttp
+
+# Gateway errors worth retrying; connection failures are retried as well
+RETRY_STATUSES = frozenset([502, 503, 504])
+
+# Connections open at once across all endpoints
+MAX_CONNECTIONS = 50
+
+async def send_task(session, semaphore, endpoint, task_data, label='task', retries=0, backoff_factor=0.5):
+    """Send a task to a student endpoint, returning the status code or None if it never got through"""
+    status = None
+    
+    for attempt in range(retries + 1):
+        if attempt:
+            # Back off before retrying, as urllib3's Retry does
+            await asyncio.sleep(backoff_factor * 2 ** (attempt - 1))
+        
+        async with semaphore:
+            try:
+                async with session.post(
+                    endpoint,
+                    json=task_data,
+                    timeout=aiohttp.ClientTimeout(total=30)
+                ) as response:
+                    status = response.status
+                    print(f"Sent {label} to {endpoint}: HTTP {status}")
+            
+            except Exception as e:
+                print(f"Error sending {label} to {endpoint}: {e}")
+                status = None
+                continue
+        
+        if status not in RETRY_STATUSES:
+            break
+    
+    return status
+
+async def send_tasks(pending, max_concurrent, label='task', retries=0):
+    """Send (endpoint, task_data) pairs concurrently, returning status codes in order"""
+    semaphore = asyncio.Semaphore(max_concurrent)
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+    
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*(
+            send_task(session, semaphore, endpoint, task_data, label, retries)
+            for endpoint, task_data in pending
+        ))
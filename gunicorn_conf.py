@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for the student API
+
+Run with:
+    gunicorn -c gunicorn_conf.py student_api.app:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('STUDENT_API_PORT', 5000)}"
+
+# Builds spend most of their time waiting on the LLM and GitHub, so gevent
+# workers let each process overlap many of them
+workers = (os.cpu_count() or 2) * 2 + 1
+worker_class = 'gevent'
+worker_connections = 100
+
+# A build can take well over the default 30 seconds
+timeout = 120
@@ -0,0 +1,15 @@
+"""
+orjson-backed JSON provider shared by the Flask apps
+"""
+
+from flask.json.provider import DefaultJSONProvider
+import orjson
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes and decodes with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
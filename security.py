@@ -5,17 +5,30 @@ Security utilities for the app build deploy system
 import re
 import os
 import json
+import uuid
 import hashlib
 import tempfile
 import subprocess
+import threading
+from collections import defaultdict, deque
 from typing import Dict, List, Tuple, Any
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 class SecurityValidator:
     """Security validation and sanitization utilities"""
     
     # Dangerous patterns that should not be in code
     DANGEROUS_PATTERNS = [
-        r'api[_-]?key\s*[=:]\s*["\']?[a-zA-Z0-9]{20,}',
+        r'api[_-]?key\s*[=:]\s*["\']?(?:sk-)?[a-zA-Z0-9]{20,}',
         r'secret[_-]?key\s*[=:]\s*["\']?[a-zA-Z0-9]{20,}',
         r'password\s*[=:]\s*["\']?[^\s"\']{8,}',
         r'token\s*[=:]\s*["\']?[a-zA-Z0-9]{20,}',
@@ -23,9 +36,31 @@ class SecurityValidator:
         r'openai[_-]?key\s*[=:]\s*["\']?sk-[a-zA-Z0-9]{48}',
     ]
     
+    # Patterns compiled once at class load; the dangerous patterns are
+    # combined into one alternation so content is traversed in a single pass.
+    # Case folding is ASCII-only so the lowercase anchor prefilter and the
+    # Hyperscan prefilter can never reject text this regex would match
+    _SECRETS_RE = re.compile('|'.join(f'(?:{p})' for p in DANGEROUS_PATTERNS),
+                             re.IGNORECASE | re.ASCII)
+    _EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    _URL_RE = re.compile(r'^https?://[a-zA-Z0-9.-]+(?:\:[0-9]+)?(?:/[^\s]*)?$')
+    _REPO_NAME_RE = re.compile(r'^[a-zA-Z0-9._-]{1,100}$')
+    _TASK_RE = re.compile(r'^[a-zA-Z0-9._-]{1,50}$')
+    _SCRIPT_SRC_RE = re.compile(r'<script[^>]+src[^>]*>[^<]*</script>', re.IGNORECASE)
+    
+    # Control characters removed by sanitize_string (tab, newline and CR are kept)
+    _CONTROL_CHARS = dict.fromkeys(i for i in range(32) if i not in (9, 10, 13))
+    
+    # JavaScript function calls commented out of generated code, matched in one pass
+    _DANGEROUS_JS_RE = re.compile(r'\b(eval|setTimeout|setInterval|Function|XMLHttpRequest)\s*\(',
+                                  re.IGNORECASE)
+    
     # Allowed file extensions for generated apps
     ALLOWED_EXTENSIONS = {'.html', '.css', '.js', '.json', '.md', '.txt', '.png', '.jpg', '.jpeg', '.gif', '.svg'}
     
+    # Allowed extensions whose content is text and worth scanning for secrets
+    ALLOWED_EXTENSIONS_TEXTUAL = {'.html', '.css', '.js', '.json', '.md', '.txt', '.svg'}
+    
     # Maximum file sizes (in bytes)
     MAX_FILE_SIZE = 1024 * 1024  # 1MB
     MAX_TOTAL_SIZE = 5 * 1024 * 1024  # 5MB
@@ -33,21 +68,24 @@ class SecurityValidator:
     @classmethod
     def validate_email(cls, email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        # Reject obviously malformed input before running the regex
+        if not (5 <= len(email) <= 254 and '@' in email and '.' in email.rsplit('@', 1)[-1]):
+            return False
+        return bool(cls._EMAIL_RE.fullmatch(email))
     
     @classmethod
     def validate_url(cls, url: str) -> bool:
         """Validate URL format"""
-        pattern = r'^https?://[a-zA-Z0-9.-]+(?:\:[0-9]+)?(?:/[^\s]*)?$'
-        return bool(re.match(pattern, url))
+        # Reject obviously malformed input before running the regex
+        if not (8 <= len(url) <= 2048 and url.startswith(('http://', 'https://'))):
+            return False
+        return bool(cls._URL_RE.fullmatch(url))
     
     @classmethod
     def validate_github_repo_name(cls, name: str) -> bool:
         """Validate GitHub repository name"""
         # GitHub repo names: 1-100 chars, alphanumeric, hyphens, underscores, dots
-        pattern = r'^[a-zA-Z0-9._-]{1,100}$'
-        return bool(re.match(pattern, name))
+        return bool(cls._REPO_NAME_RE.match(name))
     
     @classmethod
     def sanitize_string(cls, text: str, max_length: int = 1000) -> str:
@@ -56,7 +94,7 @@ class SecurityValidator:
             return ""
         
         # Remove null bytes and control characters
-        text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\r\t')
+        text = text.translate(cls._CONTROL_CHARS)
         
         # Truncate to max length
         if len(text) > max_length:
@@ -87,11 +125,15 @@ class SecurityValidator:
             return False, "Round must be 1 or 2"
         
         # Validate task name
-        if not re.match(r'^[a-zA-Z0-9._-]{1,50}$', data['task']):
+        if not cls._TASK_RE.match(data['task']):
             return False, "Invalid task name format"
         
-        # Validate nonce (UUID format)
-        if not re.match(r'^[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}$', data['nonce']):
+        # Validate nonce (hyphenated UUID format); UUID() also accepts braces,
+        # URNs and bare hex, so require the canonical form to round-trip
+        try:
+            if str(uuid.UUID(data['nonce'])) != data['nonce'].lower():
+                return False, "Invalid nonce format"
+        except (ValueError, AttributeError, TypeError):
             return False, "Invalid nonce format"
         
         # Validate brief length
@@ -107,14 +149,25 @@ class SecurityValidator:
     @classmethod
     def scan_for_secrets(cls, content: str) -> List[str]:
         """Scan content for potential secrets"""
-        findings = []
+        return [cls.describe_secret(match) for match in cls.find_secrets(content)]
+    
+    @classmethod
+    def find_secrets(cls, content: str):
+        """Yield a match for each potential secret in content"""
+        # Content without any anchor literal cannot match, skip the regex
+        if not _has_secret_anchor(content):
+            return
         
-        for pattern in cls.DANGEROUS_PATTERNS:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                findings.append(f"Potential secret found: {match.group()[:20]}...")
+        # One Hyperscan pass confirms a pattern occurs before re extracts the matches
+        if _secrets_db is not None and not _contains_secret(content):
+            return
         
-        return findings
+        yield from cls._SECRETS_RE.finditer(content)
+    
+    @staticmethod
+    def describe_secret(match) -> str:
+        """Finding message for a secret match, without revealing the secret"""
+        return f"Potential secret found: {match.group()[:20]}..."
     
     @classmethod
     def validate_generated_files(cls, files: Dict[str, str]) -> Tuple[bool, str]:
@@ -127,8 +180,9 @@ class SecurityValidator:
             if ext not in cls.ALLOWED_EXTENSIONS:
                 return False, f"Disallowed file extension: {ext}"
             
-            # Check file size
-            file_size = len(content.encode('utf-8'))
+            # Check file size; ASCII text is one byte per character, so only
+            # encode other text to measure it
+            file_size = len(content) if content.isascii() else len(content.encode('utf-8'))
             if file_size > cls.MAX_FILE_SIZE:
                 return False, f"File too large: {file_path} ({file_size} bytes)"
             
@@ -149,22 +203,136 @@ class SecurityValidator:
     def sanitize_generated_code(cls, code: str) -> str:
         """Sanitize generated code to remove potential issues"""
         # Remove potential secret patterns
-        for pattern in cls.DANGEROUS_PATTERNS:
-            code = re.sub(pattern, '[REDACTED]', code, flags=re.IGNORECASE)
+        code = cls._SECRETS_RE.sub('[REDACTED]', code)
         
         # Remove script tags with external sources
-        code = re.sub(r'<script[^>]+src[^>]*>[^<]*</script>', '', code, flags=re.IGNORECASE)
+        code = cls._SCRIPT_SRC_RE.sub('', code)
         
         # Remove dangerous JavaScript functions
-        dangerous_js = ['eval', 'setTimeout', 'setInterval', 'Function', 'XMLHttpRequest']
-        for func in dangerous_js:
-            code = re.sub(f'{func}\\s*\\(', f'// {func}(', code, flags=re.IGNORECASE)
+        code = cls._DANGEROUS_JS_RE.sub(lambda match: f'// {match.group(1)}(', code)
         
         return code
 
+def _compile_secrets_db():
+    """Compile DANGEROUS_PATTERNS into a single Hyperscan database"""
+    if hyperscan is None:
+        return None
+    
+    try:
+        db = hyperscan.Database()
+        # No HS_FLAG_UCP: classes and case folding stay ASCII, as in _SECRETS_RE
+        flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 |
+                 hyperscan.HS_FLAG_SINGLEMATCH)
+        patterns = SecurityValidator.DANGEROUS_PATTERNS
+        db.compile(
+            expressions=[p.encode('utf-8') for p in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns)
+        )
+        return db
+    except Exception as e:
+        print(f"Warning: Hyperscan unavailable, using re for secret scans: {e}")
+        return None
+
+_secrets_db = _compile_secrets_db()
+
+# A Hyperscan database has a single scratch space, so scans are serialized
+_secrets_db_lock = threading.Lock()
+
+def _contains_secret(content: str) -> bool:
+    """Whether any of DANGEROUS_PATTERNS matches somewhere in content"""
+    def on_match(pattern_id, start, end, flags, context):
+        # One match answers the question, stop scanning the rest of the content
+        return True
+    
+    try:
+        with _secrets_db_lock:
+            _secrets_db.scan(content.encode('utf-8', 'ignore'), match_event_handler=on_match)
+    except hyperscan.ScanTerminated:
+        return True
+    return False
+
+# Lowercase literals of which every DANGEROUS_PATTERNS match contains at least one
+_SECRET_ANCHORS = ('api', 'secret', 'password', 'token', 'ghp_', 'sk-')
+
+def _build_anchor_automaton():
+    """Build an Aho-Corasick automaton over _SECRET_ANCHORS"""
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for anchor in _SECRET_ANCHORS:
+        automaton.add_word(anchor, anchor)
+    automaton.make_automaton()
+    return automaton
+
+_anchor_automaton = _build_anchor_automaton()
+
+def _has_secret_anchor(content: str) -> bool:
+    """Cheap first pass: False only if content cannot contain a secret"""
+    lowered = content.lower()
+    if _anchor_automaton is None:
+        return any(anchor in lowered for anchor in _SECRET_ANCHORS)
+    return next(_anchor_automaton.iter(lowered), None) is not None
+
 class GitSecurityScanner:
     """Scan repositories for security issues"""
     
+    # Files are scanned in chunks; consecutive chunks overlap by more than the
+    # length of a realistic match so secrets across a boundary are still found
+    CHUNK_SIZE = 64 * 1024
+    CHUNK_OVERLAP = 128
+    
+    @classmethod
+    def scan_file_for_secrets(cls, file_path: str) -> List[str]:
+        """Scan a file for potential secrets without reading it all at once"""
+        findings = []
+        seen = set()  # absolute start offsets of reported matches
+        offset = 0  # absolute position of the current window
+        tail = ''
+        
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            while True:
+                chunk = f.read(cls.CHUNK_SIZE)
+                if not chunk:
+                    break
+                
+                window = tail + chunk
+                
+                for match in SecurityValidator.find_secrets(window):
+                    start = offset + match.start()
+                    if start not in seen:
+                        seen.add(start)
+                        findings.append(SecurityValidator.describe_secret(match))
+                
+                tail = window[-cls.CHUNK_OVERLAP:]
+                offset += len(window) - len(tail)
+        
+        return findings
+    
+    @classmethod
+    def _iter_files(cls, path: str):
+        """Yield a DirEntry for every file under path, skipping .git"""
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            return
+        
+        # Like os.walk, list a directory's files before descending and
+        # don't follow symlinked directories
+        subdirs = []
+        for entry in entries:
+            if not entry.is_dir():
+                yield entry
+            elif entry.name != '.git' and not entry.is_symlink():
+                subdirs.append(entry.path)
+        
+        for subdir in subdirs:
+            yield from cls._iter_files(subdir)
+    
     @classmethod
     def scan_repository(cls, repo_path: str) -> Dict[str, Any]:
         """Scan repository for security issues"""
@@ -177,58 +345,57 @@ class GitSecurityScanner:
         }
         
         try:
-            for root, dirs, files in os.walk(repo_path):
-                # Skip .git directory
-                if '.git' in dirs:
-                    dirs.remove('.git')
+            for entry in cls._iter_files(repo_path):
+                file_path = entry.path
+                relative_path = os.path.relpath(file_path, repo_path)
+                
+                results['total_files'] += 1
                 
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, repo_path)
+                try:
+                    file_size = entry.stat().st_size
+                    results['total_size'] += file_size
                     
-                    results['total_files'] += 1
+                    # Check for large files
+                    if file_size > SecurityValidator.MAX_FILE_SIZE:
+                        results['large_files'].append({
+                            'path': relative_path,
+                            'size': file_size
+                        })
                     
-                    try:
-                        file_size = os.path.getsize(file_path)
-                        results['total_size'] += file_size
-                        
-                        # Check for large files
-                        if file_size > SecurityValidator.MAX_FILE_SIZE:
-                            results['large_files'].append({
-                                'path': relative_path,
-                                'size': file_size
-                            })
-                        
-                        # Check file extension
-                        ext = os.path.splitext(file)[1].lower()
-                        if ext not in SecurityValidator.ALLOWED_EXTENSIONS:
-                            results['suspicious_files'].append({
-                                'path': relative_path,
-                                'reason': f'Disallowed extension: {ext}'
-                            })
-                            continue
-                        
-                        # Scan file content for secrets
-                        try:
-                            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-                                secrets = SecurityValidator.scan_for_secrets(content)
-                                if secrets:
-                                    results['secrets_found'].extend([
-                                        {
-                                            'path': relative_path,
-                                            'secret': secret
-                                        } for secret in secrets
-                                    ])
-                        except Exception:
-                            # Skip binary files or files that can't be read
-                            pass
-                        
-                    except Exception as e:
+                    # Check file extension
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    if ext not in SecurityValidator.ALLOWED_EXTENSIONS:
                         results['suspicious_files'].append({
                             'path': relative_path,
-                            'reason': f'Error reading file: {e}'
+                            'reason': f'Disallowed extension: {ext}'
                         })
+                        continue
+                    
+                    # Files over the size limit are already reported and images
+                    # can't hold readable secrets, so only open text files
+                    if (file_size > SecurityValidator.MAX_FILE_SIZE
+                            or ext not in SecurityValidator.ALLOWED_EXTENSIONS_TEXTUAL):
+                        continue
+                    
+                    # Scan file content for secrets
+                    try:
+                        secrets = cls.scan_file_for_secrets(file_path)
+                        if secrets:
+                            results['secrets_found'].extend([
+                                {
+                                    'path': relative_path,
+                                    'secret': secret
+                                } for secret in secrets
+                            ])
+                    except Exception:
+                        # Skip binary files or files that can't be read
+                        pass
+                    
+                except Exception as e:
+                    results['suspicious_files'].append({
+                        'path': relative_path,
+                        'reason': f'Error reading file: {e}'
+                    })
         
         except Exception as e:
             results['error'] = str(e)
@@ -239,7 +406,7 @@ class RateLimiter:
     """Simple rate limiter for API requests"""
     
     def __init__(self):
-        self.requests = {}  # email -> [timestamps]
+        self.requests = defaultdict(deque)  # email -> timestamps, oldest first
         self.max_requests_per_hour = 10
         self.max_requests_per_minute = 2
     
@@ -247,31 +414,28 @@ class RateLimiter:
         """Check if request is allowed for this email"""
         import time
         current_time = time.time()
+        timestamps = self.requests[email]
         
-        if email not in self.requests:
-            self.requests[email] = []
-        
-        # Clean old requests
-        self.requests[email] = [
-            req_time for req_time in self.requests[email]
-            if current_time - req_time < 3600  # Keep last hour
-        ]
+        # Clean old requests from the front, keeping the last hour
+        while timestamps and current_time - timestamps[0] >= 3600:
+            timestamps.popleft()
         
-        # Check minute limit
-        recent_requests = [
-            req_time for req_time in self.requests[email]
-            if current_time - req_time < 60  # Last minute
-        ]
+        # Check minute limit, counting back from the newest request
+        recent_requests = 0
+        for req_time in reversed(timestamps):
+            if current_time - req_time >= 60:  # Last minute
+                break
+            recent_requests += 1
         
-        if len(recent_requests) >= self.max_requests_per_minute:
+        if recent_requests >= self.max_requests_per_minute:
             return False, "Too many requests per minute"
         
         # Check hour limit
-        if len(self.requests[email]) >= self.max_requests_per_hour:
+        if len(timestamps) >= self.max_requests_per_hour:
             return False, "Too many requests per hour"
         
         # Allow request
-        self.requests[email].append(current_time)
+        timestamps.append(current_time)
         return True, "Request allowed"
 
 # Global rate limiter instance
@@ -1,19 +1,30 @@
 from flask import Flask, request, jsonify
-import json
+import orjson
 import os
+import sys
 import base64
 import time
 import hashlib
 import uuid
+from functools import lru_cache
+from string import Template
 from datetime import datetime
 import requests
-from github import Github
+from requests.adapters import HTTPAdapter
+from github import Github, InputGitTreeElement
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
 import shutil
 from pathlib import Path
 import openai
 
+# Add the project root to the path for the shared modules; this file is
+# also run directly as a script
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from json_provider import ORJSONProvider
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # Configuration - these should be set via environment variables
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
@@ -24,6 +35,21 @@ STUDENT_SECRET = os.getenv('STUDENT_SECRET')  # Student's secret from the form
 github_client = Github(GITHUB_TOKEN) if GITHUB_TOKEN else None
 openai.api_key = OPENAI_API_KEY
 
+# Shared HTTP session so keep-alive connections are reused across requests and retries
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16))
+http_session.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
+@lru_cache(maxsize=512)
+def _complete_prompt(prompt):
+    """Ask the LLM for a completion, reusing the answer for a repeated prompt"""
+    response = openai.ChatCompletion.create(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=2000
+    )
+    return response.choices[0].message.content
+
 class AppGenerator:
     def __init__(self):
         pass
@@ -47,12 +73,7 @@ class AppGenerator:
             """
             
             if OPENAI_API_KEY:
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=2000
-                )
-                return response.choices[0].message.content
+                return _complete_prompt(prompt)
             else:
                 # Fallback for demo purposes
                 return self._generate_fallback_app(brief)
@@ -140,7 +161,7 @@ class GitHubManager:
                 name=repo_name,
                 description=description,
                 private=False,
-                auto_init=False
+                auto_init=True
             )
             return repo
         except Exception as e:
@@ -148,14 +169,35 @@ class GitHubManager:
             raise
     
     def upload_files(self, repo, files):
-        """Upload files to repository"""
+        """Upload files (path -> bytes) to repository in one commit and return its SHA"""
         try:
-            for file_path, content in files.items():
-                repo.create_file(
-                    path=file_path,
-                    message=f"Add {file_path}",
-                    content=content
-                )
+            paths = list(files)
+            
+            def branch_head():
+                ref = repo.get_git_ref(f"heads/{repo.default_branch}")
+                return ref, repo.get_git_commit(ref.object.sha)
+            
+            # The repository is created with an initial commit, so the Git Data
+            # API can be used straight away; look that commit up while the
+            # blobs are created in parallel, then add them all in one commit
+            with ThreadPoolExecutor(max_workers=min(8, len(paths)) + 1) as executor:
+                head_future = executor.submit(branch_head)
+                blobs = list(executor.map(
+                    lambda file_path: repo.create_git_blob(
+                        base64.b64encode(files[file_path]).decode('ascii'), 'base64'
+                    ),
+                    paths
+                ))
+                ref, parent = head_future.result()
+            
+            tree = repo.create_git_tree(
+                [InputGitTreeElement(file_path, '100644', 'blob', sha=blob.sha)
+                 for file_path, blob in zip(paths, blobs)],
+                base_tree=parent.tree
+            )
+            commit = repo.create_git_commit(f"Add {', '.join(paths)}", tree, [parent])
+            ref.edit(commit.sha)
+            return commit.sha
         except Exception as e:
             print(f"Error uploading files: {e}")
             raise
@@ -176,7 +218,7 @@ class GitHubManager:
                 }
             }
             
-            response = requests.post(url, headers=headers, json=data)
+            response = http_session.post(url, headers=headers, json=data)
             if response.status_code in [201, 409]:  # 409 if already enabled
                 return True
             else:
@@ -190,9 +232,14 @@ def verify_secret(provided_secret):
     """Verify the student's secret"""
     return provided_secret == STUDENT_SECRET
 
-def generate_mit_license():
-    """Generate MIT LICENSE content"""
-    year = datetime.now().year
+@lru_cache(maxsize=4096)
+def _email_bucket(email):
+    """Short stable hash of an email, used to make repo names unique"""
+    return hashlib.blake2b(email.encode('utf-8'), digest_size=4).hexdigest()
+
+@lru_cache(maxsize=2)
+def _license_for_year(year):
+    """MIT LICENSE content for a given copyright year"""
     return f"""MIT License
 
 Copyright (c) {year} Student
@@ -216,22 +263,25 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-def generate_readme(task, brief, repo_url):
-    """Generate professional README.md"""
-    return f"""# {task.replace('-', ' ').title()}
+def generate_mit_license():
+    """Generate MIT LICENSE content"""
+    return _license_for_year(datetime.now().year)
+
+# README.md skeleton, parsed once
+README_TEMPLATE = Template("""# $title
 
 ## Summary
 
 This application was automatically generated based on the following brief:
 
-> {brief}
+> $brief
 
 ## Setup
 
 1. Clone the repository:
    ```bash
-   git clone {repo_url}
-   cd {repo_url.split('/')[-1]}
+   git clone $repo_url
+   cd $repo_dir
    ```
 
 2. Open `index.html` in your web browser or serve it using a simple HTTP server:
@@ -265,12 +315,22 @@ This project is licensed under the MIT License - see the [LICENSE](LICENSE) file
 ## Deployment
 
 This application is automatically deployed to GitHub Pages and accessible at:
-{repo_url.replace('github.com', 'github.io').replace('/', '/', 1)}
+$pages_url
 
 ---
 
 *This application was generated automatically as part of the IITM application development project.*
-"""
+""")
+
+def generate_readme(task, brief, repo_url):
+    """Generate professional README.md"""
+    return README_TEMPLATE.substitute(
+        title=task.replace('-', ' ').title(),
+        brief=brief,
+        repo_url=repo_url,
+        repo_dir=repo_url.split('/')[-1],
+        pages_url=repo_url.replace('github.com', 'github.io').replace('/', '/', 1)
+    )
 
 def notify_evaluation_api(data, max_retries=5):
     """Notify evaluation API with exponential backoff"""
@@ -288,12 +348,15 @@ def notify_evaluation_api(data, max_retries=5):
         'pages_url': data['pages_url']
     }
     
+    # Serialize once rather than on every retry
+    body = orjson.dumps(payload)
+    
     for attempt in range(max_retries):
         try:
-            response = requests.post(
+            response = http_session.post(
                 evaluation_url,
                 headers={'Content-Type': 'application/json'},
-                json=payload,
+                data=body,
                 timeout=30
             )
             
@@ -337,7 +400,7 @@ def build_application():
             return jsonify({'error': 'GitHub integration not configured'}), 500
         
         # Generate unique repo name
-        repo_name = f"{data['task']}-{hashlib.md5(data['email'].encode()).hexdigest()[:8]}"
+        repo_name = f"{data['task']}-{_email_bucket(data['email'])}"
         
         # Initialize components
         app_generator = AppGenerator()
@@ -353,32 +416,27 @@ def build_application():
         
         # Prepare files
         files = {
-            'index.html': app_code,
-            'LICENSE': generate_mit_license(),
-            'README.md': generate_readme(data['task'], data['brief'], repo.html_url)
+            'index.html': app_code.encode('utf-8'),
+            'LICENSE': generate_mit_license().encode('utf-8'),
+            'README.md': generate_readme(data['task'], data['brief'], repo.html_url).encode('utf-8')
         }
         
         # Process attachments if any
         if data.get('attachments'):
             for attachment in data['attachments']:
                 if attachment.get('url') and attachment['url'].startswith('data:'):
-                    # Decode data URI
+                    # Decode data URI, keeping binary attachments intact
                     header, encoded = attachment['url'].split(',', 1)
-                    file_data = base64.b64decode(encoded)
-                    files[attachment['name']] = file_data.decode('utf-8', errors='ignore')
+                    files[attachment['name']] = base64.b64decode(encoded)
         
         # Upload files to repository
         print("Uploading files to repository")
-        github_manager.upload_files(repo, files)
+        commit_sha = github_manager.upload_files(repo, files)
         
         # Enable GitHub Pages
         print("Enabling GitHub Pages")
         pages_enabled = github_manager.enable_pages(repo)
         
-        # Get commit SHA
-        commits = list(repo.get_commits())
-        commit_sha = commits[0].sha if commits else "unknown"
-        
         # Generate Pages URL
         pages_url = f"https://{github_client.get_user().login}.github.io/{repo_name}/"
         
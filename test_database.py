@@ -0,0 +1,114 @@
+"""
+Tests for the SQLite data layer in database/database.py
+"""
+
+import pytest
+
+from database import DatabaseManager
+
+def _result(email, check_name, score=1.0):
+    """An evaluation result row"""
+    return {
+        'email': email,
+        'task': 'captcha-solver-abc12',
+        'round': 1,
+        'repo_url': 'https://github.com/student/captcha-solver',
+        'commit_sha': 'abc123',
+        'pages_url': 'https://student.github.io/captcha-solver/',
+        'check_name': check_name,
+        'score': score,
+        'reason': 'ok'
+    }
+
+@pytest.fixture
+def db(tmp_path):
+    """A pooled database in a temporary file"""
+    manager = DatabaseManager(str(tmp_path / 'evaluation.db'))
+    yield manager
+    manager.close()
+
+def test_memory_database_uses_a_single_connection(make_task):
+    """Every pooled connection to :memory: would see its own empty database"""
+    manager = DatabaseManager(':memory:', pool_size=5)
+    try:
+        assert manager.pool.size == 1
+        assert manager.insert_tasks_bulk([make_task('memory@example.com')])
+        assert manager.get_emails_with_round(1) == {'memory@example.com'}
+    finally:
+        manager.close()
+
+def test_insert_tasks_bulk_round_trip(db, make_task):
+    """Bulk inserted tasks read back with all their fields"""
+    tasks = [make_task('a@example.com'), make_task('b@example.com', round_num=2)]
+    assert db.insert_tasks_bulk(tasks)
+    
+    stored = {task['email']: task for task in db.get_tasks()}
+    assert set(stored) == {'a@example.com', 'b@example.com'}
+    assert stored['b@example.com']['round'] == 2
+    assert stored['a@example.com']['statuscode'] == 200
+    
+    # One timestamp is shared by the whole batch
+    assert stored['a@example.com']['timestamp'] == stored['b@example.com']['timestamp']
+
+def test_insert_tasks_bulk_rolls_back_on_failure(db, make_task):
+    """A bad row aborts the whole batch"""
+    bad = make_task('bad@example.com')
+    bad['brief'] = None  # violates NOT NULL
+    
+    assert not db.insert_tasks_bulk([make_task('good@example.com'), bad])
+    assert db.get_tasks() == []
+
+def test_insert_results_bulk_round_trip_and_rollback(db):
+    """Results are inserted together or not at all"""
+    assert db.insert_results_bulk([_result('a@example.com', 'license'),
+                                   _result('a@example.com', 'readme', 0.5)])
+    assert {r['check_name']: r['score'] for r in db.get_results(email='a@example.com')} == {
+        'license': 1.0, 'readme': 0.5}
+    
+    assert not db.insert_results_bulk([_result('b@example.com', 'license'),
+                                       _result('b@example.com', 'readme', None)])
+    assert db.get_results(email='b@example.com') == []
+
+def test_update_task_statuses_bulk(db, make_task):
+    """Status codes are updated per (email, task, round)"""
+    assert db.insert_tasks_bulk([make_task('a@example.com', statuscode=503),
+                                 make_task('b@example.com', statuscode=500)])
+    
+    assert db.update_task_statuses_bulk([(200, 'a@example.com', 'captcha-solver-abc12', 1)])
+    statuses = {task['email']: task['statuscode'] for task in db.get_tasks()}
+    assert statuses == {'a@example.com': 200, 'b@example.com': 500}
+
+def test_find_task(db, make_task):
+    """A task is found only when email, round, task and nonce all match"""
+    assert db.insert_task(make_task('a@example.com'))
+    
+    found = db.find_task('a@example.com', 1, 'captcha-solver-abc12', 'nonce-1')
+    assert found['email'] == 'a@example.com'
+    assert found['checks'] == '["Repo has MIT license"]'
+    
+    assert db.find_task('a@example.com', 1, 'captcha-solver-abc12', 'other-nonce') is None
+    assert db.find_task('a@example.com', 2, 'captcha-solver-abc12', 'nonce-1') is None
+
+def test_get_emails_with_round(db, make_task):
+    """Only emails with a task in the requested round are returned"""
+    assert db.insert_tasks_bulk([
+        make_task('a@example.com'),
+        make_task('a@example.com', task='todo-manager-xyz98'),
+        make_task('b@example.com', round_num=2)
+    ])
+    
+    assert db.get_emails_with_round(1) == {'a@example.com'}
+    assert db.get_emails_with_round(2) == {'b@example.com'}
+    assert db.get_emails_with_round(3) == set()
+
+def test_llm_cache(db):
+    """Cached LLM scores are keyed by content hash and kind"""
+    assert db.get_llm_score('hash-1', 'readme') is None
+    
+    assert db.insert_llm_score('hash-1', 'readme', 0.8, 'Clear and complete')
+    assert db.get_llm_score('hash-1', 'readme') == (0.8, 'Clear and complete')
+    assert db.get_llm_score('hash-1', 'code') is None
+    
+    # A newer score replaces the cached one
+    assert db.insert_llm_score('hash-1', 'readme', 0.6, 'Rescored')
+    assert db.get_llm_score('hash-1', 'readme') == (0.6, 'Rescored')
@@ -0,0 +1,89 @@
+"""
+Tests for the evaluation API endpoints
+"""
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+def _notification(email, task='captcha-solver-abc12', round_num=1, nonce='nonce-1'):
+    """A repo submission notification as sent by the student API"""
+    return {
+        'email': email,
+        'task': task,
+        'round': round_num,
+        'nonce': nonce,
+        'repo_url': f'https://github.com/student/{task}',
+        'commit_sha': 'abc123',
+        'pages_url': f'https://student.github.io/{task}/'
+    }
+
+@pytest.fixture
+def shared_cache(evaluation_api):
+    """Back the response cache with an in-memory store, standing in for Redis"""
+    cache = evaluation_api.cache
+    cache.init_app(evaluation_api.app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 30})
+    yield cache
+    cache.init_app(evaluation_api.app, config={'CACHE_TYPE': 'NullCache'})
+
+def test_notify_rejects_malformed_json(evaluation_client):
+    """Malformed JSON is a 400, not an internal error"""
+    response = evaluation_client.post('/api/notify', data='{"email": ',
+                                      content_type='application/json')
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('field,value', [
+    ('email', None),
+    ('round', '1'),
+    ('repo_url', 42)
+])
+def test_notify_rejects_schema_violations(evaluation_client, field, value):
+    """Missing or mistyped fields are rejected by the schema"""
+    payload = _notification('schema@example.com')
+    if value is None:
+        del payload[field]
+    else:
+        payload[field] = value
+    
+    response = evaluation_client.post('/api/notify', json=payload)
+    assert response.status_code == 400
+    assert 'Invalid request' in response.get_json()['error']
+
+def test_notify_requires_matching_task(evaluation_client):
+    """A notification without a matching task is rejected"""
+    response = evaluation_client.post('/api/notify', json=_notification('unknown@example.com'))
+    assert response.status_code == 400
+    assert 'No matching task' in response.get_json()['error']
+
+def test_listings_are_not_cached_without_redis(evaluation_api, evaluation_client):
+    """Without a shared cache every worker reads the database directly"""
+    email = 'uncached@example.com'
+    url = f'/api/repos?email={email}'
+    assert evaluation_client.get(url).get_json()['count'] == 0
+    
+    assert evaluation_api.db.insert_repo(_notification(email, task='todo-manager-xyz98'))
+    assert evaluation_client.get(url).get_json()['count'] == 1
+
+def test_listings_are_cached_per_query_string(evaluation_api, evaluation_client, shared_cache):
+    """Repeated queries are served from the cache, keyed by their query string"""
+    email = 'cached@example.com'
+    url = f'/api/repos?email={email}'
+    assert evaluation_client.get(url).get_json()['count'] == 0
+    
+    # Written behind the API's back, so the cached listing is stale
+    assert evaluation_api.db.insert_repo(_notification(email, task='todo-manager-xyz98'))
+    assert evaluation_client.get(url).get_json()['count'] == 0
+    
+    # A different query string is a different cache entry
+    assert evaluation_client.get(f'{url}&round=1').get_json()['count'] == 1
+
+def test_notify_clears_cached_listings(evaluation_api, evaluation_client, shared_cache, make_task):
+    """A stored submission invalidates the cached listings"""
+    email = 'notify@example.com'
+    url = f'/api/repos?email={email}'
+    assert evaluation_api.db.insert_task(make_task(email))
+    assert evaluation_client.get(url).get_json()['count'] == 0
+    
+    response = evaluation_client.post('/api/notify', json=_notification(email))
+    assert response.status_code == 200
+    assert evaluation_client.get(url).get_json()['count'] == 1
@@ -0,0 +1,139 @@
+"""
+Tests for the security helpers in security.py
+"""
+
+import pytest
+
+import security
+from security import GitSecurityScanner, RateLimiter, SecurityValidator
+
+@pytest.mark.parametrize('content', [
+    "ſecret_key = 'abcdefghijklmnopqrstuvwxyz'",  # long s folds to 's' in Unicode
+    "api_Key = 'abcdefghijklmnopqrstuvwxyz'",  # Kelvin sign folds to 'k'
+    "SECRET_KEY = 'abcdefghijklmnopqrstuvwxyz'",
+    "Password: 'hunter2hunter2'"
+])
+def test_secret_prefilters_agree_with_regex(content):
+    """The cheap prefilters never reject content the regex matches"""
+    expected = SecurityValidator._SECRETS_RE.search(content) is not None
+    assert bool(SecurityValidator.scan_for_secrets(content)) is expected
+
+def test_secret_prefilters_agree_without_optional_engines(monkeypatch):
+    """The pure-Python fallbacks give the same answers"""
+    monkeypatch.setattr(security, '_anchor_automaton', None)
+    monkeypatch.setattr(security, '_secrets_db', None)
+    
+    assert not SecurityValidator.scan_for_secrets("ſecret_key = 'abcdefghijklmnopqrstuvwxyz'")
+    assert SecurityValidator.scan_for_secrets("SECRET_KEY = 'abcdefghijklmnopqrstuvwxyz'")
+
+SECRET_LINE = "api_key = 'abcdefghijklmnopqrstuvwxyz'"
+
+def test_scan_file_finds_secret_across_chunk_boundary(tmp_path):
+    """A secret split between two reads is still found, once"""
+    path = tmp_path / 'app.js'
+    padding = 'x' * (GitSecurityScanner.CHUNK_SIZE - 10)
+    path.write_text(f"{padding}\n{SECRET_LINE}\n{'y' * 100}")
+    
+    assert len(GitSecurityScanner.scan_file_for_secrets(str(path))) == 1
+
+def test_scan_file_reports_overlap_match_once(tmp_path):
+    """A secret inside the overlap carried into the next window is not reported twice"""
+    path = tmp_path / 'app.js'
+    padding = 'x' * (GitSecurityScanner.CHUNK_SIZE - len(SECRET_LINE) - 20)
+    path.write_text(f"{padding}\n{SECRET_LINE}\n{'y' * 1000}")
+    
+    assert len(GitSecurityScanner.scan_file_for_secrets(str(path))) == 1
+
+def test_scan_repository_skips_git_binary_and_oversized_files(tmp_path, monkeypatch):
+    """Only text files within the size limit outside .git are read"""
+    monkeypatch.setattr(SecurityValidator, 'MAX_FILE_SIZE', 1000)
+    
+    (tmp_path / '.git').mkdir()
+    (tmp_path / '.git' / 'config').write_text(SECRET_LINE)
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'assets' / 'logo.png').write_bytes(b'\x89PNG\r\n' + SECRET_LINE.encode())
+    (tmp_path / 'big.txt').write_text(SECRET_LINE + ' ' * 2000)
+    (tmp_path / 'index.html').write_text('<h1>Captcha Solver</h1>')
+    (tmp_path / 'config.js').write_text(SECRET_LINE)
+    
+    results = GitSecurityScanner.scan_repository(str(tmp_path))
+    
+    assert results['total_files'] == 4
+    assert [finding['path'] for finding in results['secrets_found']] == ['config.js']
+    assert [entry['path'] for entry in results['large_files']] == ['big.txt']
+    assert results['suspicious_files'] == []
+    assert results['total_size'] == sum(
+        (tmp_path / name).stat().st_size
+        for name in ('assets/logo.png', 'big.txt', 'index.html', 'config.js'))
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for time.time()"""
+    now = [0.0]
+    monkeypatch.setattr('time.time', lambda: now[0])
+    return now
+
+def test_rate_limiter_minute_window(clock):
+    """Two requests per minute, freed once the oldest is a minute old"""
+    limiter = RateLimiter()
+    assert limiter.is_allowed('a@example.com')[0]
+    clock[0] = 1
+    assert limiter.is_allowed('a@example.com')[0]
+    clock[0] = 2
+    assert limiter.is_allowed('a@example.com') == (False, "Too many requests per minute")
+    
+    # Other emails have their own window
+    assert limiter.is_allowed('b@example.com')[0]
+    
+    clock[0] = 61
+    assert limiter.is_allowed('a@example.com')[0]
+
+def test_rate_limiter_hour_window_and_eviction(clock):
+    """Ten requests per hour; timestamps older than an hour are dropped"""
+    limiter = RateLimiter()
+    for i in range(10):
+        clock[0] = i * 61
+        assert limiter.is_allowed('a@example.com')[0]
+    
+    clock[0] = 10 * 61
+    assert limiter.is_allowed('a@example.com') == (False, "Too many requests per hour")
+    
+    # Denied requests are not recorded
+    assert len(limiter.requests['a@example.com']) == 10
+    
+    # The first request ages out of the hour window
+    clock[0] = 3600
+    assert limiter.is_allowed('a@example.com')[0]
+    assert limiter.requests['a@example.com'][0] == 61
+
+@pytest.mark.parametrize('text,expected', [
+    ("\x00a\x07b\x1bc", "abc"),
+    ("line\tone\r\nline two", "line\tone\r\nline two"),
+    ("  padded  ", "padded"),
+    (None, "")
+])
+def test_sanitize_string_strips_control_characters(text, expected):
+    """Control characters other than tab, newline and CR are removed"""
+    assert SecurityValidator.sanitize_string(text) == expected
+
+def test_sanitize_string_caps_length():
+    """Input is truncated to max_length"""
+    assert SecurityValidator.sanitize_string('a' * 2000) == 'a' * 1000
+    assert SecurityValidator.sanitize_string('abcdef', max_length=3) == 'abc'
+
+@pytest.mark.parametrize('code,expected', [
+    ("eval('1 + 1');", "// eval('1 + 1');"),
+    ("setTimeout (tick, 100);", "// setTimeout(tick, 100);"),
+    ("EVAL(x); new Function('y');", "// EVAL(x); new // Function('y');"),
+    ("medieval(x); retrieval(y); myFunction(z);", "medieval(x); retrieval(y); myFunction(z);"),
+    ("const evaluation = 1;", "const evaluation = 1;")
+])
+def test_sanitize_generated_code_comments_out_dangerous_calls(code, expected):
+    """Only whole-word dangerous calls are commented out, keeping their casing"""
+    assert SecurityValidator.sanitize_generated_code(code) == expected
+
+def test_sanitize_generated_code_removes_external_scripts_and_secrets():
+    """External script tags and secrets are stripped from generated code"""
+    code = '<script src="https://cdn.example.com/x.js"></script>\n' + SECRET_LINE
+    # The pattern stops at the value, so the closing quote is left behind
+    assert SecurityValidator.sanitize_generated_code(code) == "\n[REDACTED]'"
@@ -0,0 +1,62 @@
+"""
+Tests for the student API's GitHub upload path, against mocked repositories
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+@pytest.fixture
+def app_module(student_client):
+    """The student API module, loaded through the shared client fixture"""
+    import student_api.app
+    return student_api.app
+
+@pytest.fixture
+def manager(app_module, monkeypatch):
+    """A GitHubManager that never talks to GitHub"""
+    monkeypatch.setattr(app_module, 'Github', MagicMock())
+    return app_module.GitHubManager('token')
+
+def _repo():
+    """Mock repository initialised with one commit on main"""
+    repo = MagicMock()
+    repo.default_branch = 'main'
+    repo.get_git_ref.return_value.object.sha = 'initial'
+    repo.get_git_commit.return_value = MagicMock(sha='initial', tree=MagicMock(sha='initial-tree'))
+    repo.create_git_blob.side_effect = lambda content, encoding: MagicMock(sha=f"blob-{content}")
+    repo.create_git_tree.return_value = MagicMock(sha='tree')
+    repo.create_git_commit.return_value = MagicMock(sha='new-commit')
+    return repo
+
+def test_create_repo_initialises_branch(manager):
+    """Test that new repositories start with a commit the Git Data API can build on"""
+    manager.create_repo('app')
+    assert manager.user.create_repo.call_args.kwargs['auto_init'] is True
+
+@pytest.mark.parametrize('files', [
+    {'index.html': b'<html>'},
+    {'index.html': b'<html>', 'LICENSE': b'MIT', 'README.md': b'# App'}
+])
+def test_upload_files_in_one_commit(manager, files):
+    """Test that every file lands in a single commit on top of the initial one"""
+    repo = _repo()
+    
+    assert manager.upload_files(repo, files) == 'new-commit'
+    assert not repo.create_file.called
+    assert repo.create_git_blob.call_count == len(files)
+    repo.get_git_ref.assert_called_once_with('heads/main')
+    repo.get_git_commit.assert_called_once_with('initial')
+    
+    # The tree adds every file on top of the initial commit's tree
+    parent = repo.get_git_commit.return_value
+    (elements,), kwargs = repo.create_git_tree.call_args
+    assert [e._identity['path'] for e in elements] == list(files)
+    assert kwargs['base_tree'] is parent.tree
+    
+    repo.create_git_commit.assert_called_once_with(
+        f"Add {', '.join(files)}", repo.create_git_tree.return_value, [parent]
+    )
+    repo.get_git_ref.return_value.edit.assert_called_once_with('new-commit')
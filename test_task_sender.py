@@ -0,0 +1,73 @@
+"""
+Tests for the shared task sender and the round 2 retry bookkeeping
+"""
+
+import asyncio
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from evaluation_system import round2
+from evaluation_system.task_sender import send_task, send_tasks
+
+def _serve_statuses(statuses):
+    """Run send_tasks against a local endpoint answering with the given statuses in turn"""
+    calls = []
+    replies = iter(statuses)
+    
+    async def handler(request):
+        calls.append(await request.json())
+        return web.Response(status=next(replies))
+    
+    async def run(retries):
+        app = web.Application()
+        app.router.add_post('/api/build', handler)
+        async with TestServer(app) as server:
+            url = str(server.make_url('/api/build'))
+            return await send_tasks([(url, {'task': 'demo'})], 1, retries=retries)
+    
+    return calls, run
+
+def test_send_tasks_retries_gateway_errors():
+    """A 503 is retried and the final status is returned"""
+    calls, run = _serve_statuses([503, 200])
+    assert asyncio.run(run(retries=2)) == [200]
+    assert calls == [{'task': 'demo'}, {'task': 'demo'}]
+
+def test_send_tasks_does_not_retry_client_errors():
+    """Statuses outside the retry list are returned as-is"""
+    calls, run = _serve_statuses([500, 200])
+    assert asyncio.run(run(retries=2)) == [500]
+    assert len(calls) == 1
+
+def test_send_task_returns_none_when_unreachable():
+    """A send that never connects reports None after its retries"""
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            return await send_task(session, asyncio.Semaphore(1), 'http://127.0.0.1:9/api/build',
+                                   {}, retries=1, backoff_factor=0)
+    
+    assert asyncio.run(run()) is None
+
+def test_retry_keeps_previous_status_when_send_fails(tmp_path, monkeypatch):
+    """A retry without a response must not erase the stored failure code"""
+    generator = round2.Round2TaskGenerator('http://localhost:5001/api/notify', str(tmp_path / 'tasks.db'))
+    tasks = []
+    for email, statuscode in (('down@example.com', 503), ('up@example.com', 500)):
+        tasks.append({
+            'email': email, 'secret': 's', 'task': 'todo-manager-xyz98', 'round': 2,
+            'nonce': 'n', 'brief': 'b', 'checks': [], 'attachments': [],
+            'evaluation_url': 'http://localhost:5001/api/notify',
+            'endpoint': f'http://localhost:5000/{email}', 'statuscode': statuscode
+        })
+    assert generator.db.insert_tasks_bulk(tasks)
+    
+    async def fake_send_tasks(pending, max_concurrent, label='task', retries=0):
+        return [None if 'down@' in endpoint else 200 for endpoint, _ in pending]
+    
+    monkeypatch.setattr(round2, 'send_tasks', fake_send_tasks)
+    generator.retry_failed_round2_tasks()
+    
+    statuses = {task['email']: task['statuscode'] for task in generator.db.get_tasks(round_num=2)}
+    assert statuses == {'down@example.com': 503, 'up@example.com': 200}
+    generator.db.close()
@@ -0,0 +1,8 @@
+"""
+WSGI entry point for the evaluation API
+
+Run with:
+    gunicorn -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:5001 wsgi:app
+"""
+
+from evaluation_system.evaluation_api import app